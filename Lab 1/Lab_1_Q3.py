@@ -1,4 +1,5 @@
 #Q3. Write a python program to read a square matrix(n*n) where all the elements are string. hence find the transpose of this matrix.
+from matrix import Matrix
 
 # Step 1: Take size of square matrix
 n = int(input("Enter the size of the square matrix (n): "))
@@ -13,13 +14,8 @@ for i in range(n):
         row.append(val)
     matrix.append(row)
 
-# Step 3: Find the transpose
-transpose = []
-for i in range(n):
-    row = []
-    for j in range(n):
-        row.append(matrix[j][i])  # Swap row and column
-    transpose.append(row)
+# Step 3: Find the transpose (a view over the same buffer, rows and columns swapped)
+transpose = Matrix.from_rows(matrix).T
 
 # Step 4: Print result
 print("\nOriginal Matrix:") ## To get a matrix looking output for loop used 
@@ -1,56 +1,41 @@
 #Q4.
+import inversion
+from adjugate import adjugate
+from determinant import det, det_exact, is_integer_matrix
+from matrix import as_matrix
+
 # Function to check if a matrix is symmetric
 def is_symmetric(matrix, n):
-    for i in range(n):
-        for j in range(n):
-            if matrix[i][j] != matrix[j][i]:
-                return False
-    return True
+    return as_matrix(matrix).is_symmetric()
 
-# Function to get cofactor of matrix
+# Function to get cofactor of matrix (a view that shares memory with mat, see matrix.py)
 def get_cofactor(mat, p, q, n):
-    temp = []
-    for i in range(n):
-        if i != p:
-            row = []
-            for j in range(n):
-                if j != q:
-                    row.append(mat[i][j])
-            temp.append(row)
-    return temp
+    return as_matrix(mat).minor(p, q)
 
-# Function to calculate determinant
+# Function to calculate determinant (exact for integers, LU otherwise; see determinant.py)
 def determinant(mat, n):
-    if n == 1:
-        return mat[0][0]
-    det = 0
-    sign = 1
-    for f in range(n):
-        temp = get_cofactor(mat, 0, f, n)
-        det += sign * mat[0][f] * determinant(temp, n-1)
-        sign = -sign
-    return det
+    if is_integer_matrix(mat):
+        return det_exact(mat)  # Bareiss / multi-modular, no rounding error
+    return det(mat)
 
-# Function to calculate adjoint
+# Function to calculate adjoint (one O(n^3) elimination, see adjugate.py)
 def adjoint(mat, n):
     if n == 1:
         return [[1]]
-    adj = [[0 for _ in range(n)] for _ in range(n)]
-    for i in range(n):
-        for j in range(n):
-            temp = get_cofactor(mat, i, j, n)
-            sign = 1 if (i+j) % 2 == 0 else -1
-            adj[j][i] = sign * determinant(temp, n-1)  # transpose while assigning
-    return adj
+    return adjugate(mat).tolist()
 
-# Function to calculate inverse
+# Function to calculate inverse (Gauss-Jordan, see inversion.py)
 def inverse(mat, n):
     det = determinant(mat, n)
     if det == 0:
         return None
-    adj = adjoint(mat, n)
-    inv = [[adj[i][j] / det for j in range(n)] for i in range(n)]
-    return inv
+    if is_integer_matrix(mat):
+        # adj(A) and det(A) are exact here, so one division per entry is correctly rounded
+        return [[v / det for v in row] for row in adjoint(mat, n)]
+    X, singular = inversion.inv(mat)
+    if len(singular):
+        return None
+    return X.tolist()
 
 # MAIN PROGRAM
 n = int(input("Enter order of square matrix (n): "))
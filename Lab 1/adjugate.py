@@ -0,0 +1,136 @@
+# Adjugate (adjoint) and cofactor matrix from a single factorization.
+# Lab_1_Q4 / Lab_2_Q2 used to take n^2 separate determinants of minors;
+# everything here is O(n^3).
+from fractions import Fraction
+from math import gcd
+
+import numpy as np
+
+from determinant import det, det_bareiss, is_integer_matrix, lu_factor, lu_solve
+
+
+# Function to get adj(A) of a nonsingular integer matrix by fraction-free Gauss-Jordan
+def _adjugate_bareiss(A):
+    """
+    Fraction-free Gauss-Jordan on [A | I]. Every division is exact and the
+    result is [d I | d A^-1] with d = +-det(A), so the right block is adj(A).
+    Returns None when A is singular.
+    """
+    n = len(A)
+    M = np.zeros((n, 2 * n), dtype=object)
+    M[:, :n] = [[int(v) for v in row] for row in A]
+    M[:, n:] = [[int(i == j) for j in range(n)] for i in range(n)]
+    sign = 1
+    prev = 1
+    for k in range(n):
+        if M[k, k] == 0:
+            nonzero = np.nonzero(M[k + 1:, k] != 0)[0]
+            if len(nonzero) == 0:
+                return None
+            p = k + 1 + nonzero[0]
+            M[[k, p]] = M[[p, k]]
+            sign = -sign
+        others = np.arange(n) != k
+        M[others] = (M[others] * M[k, k] - np.outer(M[others, k], M[k])) // prev
+        prev = M[k, k]
+    return sign * M[:, n:]
+
+
+# Function to find the rank and one null vector (integer entries) of A
+def _null_vector(A):
+    n, m = len(A), len(A[0])
+    R = [[Fraction(int(v)) for v in row] for row in A]
+    pivots = []
+    r = 0
+    for c in range(m):
+        p = next((i for i in range(r, n) if R[i][c] != 0), None)
+        if p is None:
+            continue
+        R[r], R[p] = R[p], R[r]
+        R[r] = [v / R[r][c] for v in R[r]]
+        for i in range(n):
+            if i != r and R[i][c] != 0:
+                f = R[i][c]
+                R[i] = [a - f * b for a, b in zip(R[i], R[r])]
+        pivots.append(c)
+        r += 1
+        if r == n:
+            break
+    free = next((c for c in range(m) if c not in pivots), None)
+    if free is None:
+        return r, None
+    x = [Fraction(0)] * m
+    x[free] = Fraction(1)
+    for i, c in enumerate(pivots):
+        x[c] = -R[i][free]
+    # Clear denominators
+    scale = 1
+    for v in x:
+        scale = scale * v.denominator // gcd(scale, v.denominator)
+    return r, [int(v * scale) for v in x]
+
+
+# Function to get adj(A) of a singular integer matrix
+def _adjugate_singular_exact(A):
+    """
+    rank(A) < n-1  ->  adj(A) = 0.
+    rank(A) = n-1  ->  adj(A) = c x y^T with A x = 0 and y^T A = 0;
+    the scale c comes from one cofactor (one Bareiss determinant).
+    """
+    n = len(A)
+    rank, x = _null_vector(A)
+    if rank < n - 1:
+        return np.full((n, n), 0, dtype=object)
+    _, y = _null_vector([list(col) for col in zip(*A)])
+    i = next(k for k in range(n) if x[k] != 0)
+    j = next(k for k in range(n) if y[k] != 0)
+    # adj(A)[i][j] is the (j, i) cofactor
+    minor = [[A[r][c] for c in range(n) if c != i] for r in range(n) if r != j]
+    entry = (-1) ** (i + j) * det_bareiss(minor)
+    c = Fraction(entry, x[i] * y[j])
+    adj = np.empty((n, n), dtype=object)
+    for r in range(n):
+        for s in range(n):
+            adj[r, s] = int(c * x[r] * y[s])
+    return adj
+
+
+# Function to get adj(A) for floating point input
+def _adjugate_float(A):
+    A = np.asarray(A, dtype=float)
+    n = A.shape[0]
+    lu, perm, sign = lu_factor(A)
+    pivots = np.abs(np.diag(lu))
+    if pivots.min() > n * np.finfo(float).eps * pivots.max():
+        # Nonsingular: adj(A) = det(A) A^-1 from the same factorization
+        d = sign * np.prod(np.diag(lu))
+        return d * lu_solve((lu, perm), np.eye(n))
+    # Singular or nearly so: A = U S V^T  ->  adj(A) = det(U) det(V) V adj(S) U^T
+    U, s, Vt = np.linalg.svd(A)
+    prefix = np.concatenate(([1.0], np.cumprod(s)[:-1]))
+    suffix = np.concatenate((np.cumprod(s[::-1])[:-1][::-1], [1.0]))
+    adj_s = prefix * suffix  # product of all singular values except s_i
+    return det(U) * det(Vt) * (Vt.T * adj_s) @ U.T
+
+
+# Function to compute the adjugate (transpose of the cofactor matrix)
+def adjugate(A):
+    """
+    adj(A) in O(n^3). Integer input gives exact integers (object array),
+    otherwise a float array.
+    """
+    n = len(A)
+    if n == 0:
+        return np.zeros((0, 0))
+    if n == 1:
+        return np.array([[1]], dtype=object if is_integer_matrix(A) else float)
+    if is_integer_matrix(A):
+        rows = [[int(v) for v in row] for row in A]
+        adj = _adjugate_bareiss(rows)
+        return adj if adj is not None else _adjugate_singular_exact(rows)
+    return _adjugate_float(A)
+
+
+# Function to compute the cofactor matrix
+def cofactor_matrix(A):
+    return adjugate(A).T
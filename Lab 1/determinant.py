@@ -0,0 +1,293 @@
+# Determinant engine: LU factorization with partial pivoting for floats and
+# exact Bareiss / multi-modular paths for integers. The cofactor expansion in
+# Lab_1_Q4 / Lab_2_Q2 is O(n!) ; these are O(n^3).
+import numpy as np
+
+
+# Function to solve T x = B when T is triangular (forward / back substitution)
+def solve_triangular(T, B, lower=False, unit_diagonal=False):
+    """Solve T x = B for a triangular T in O(n^2) per right-hand side."""
+    T = np.asarray(T)
+    X = np.array(B, dtype=np.result_type(T.dtype, np.asarray(B).dtype, np.float32))
+    n = T.shape[0]
+    order = range(n) if lower else range(n - 1, -1, -1)
+    for i in order:
+        if lower:
+            if i > 0:
+                X[i] -= T[i, :i] @ X[:i]
+        elif i < n - 1:
+            X[i] -= T[i, i + 1:] @ X[i + 1:]
+        if not unit_diagonal:
+            X[i] /= T[i, i]
+    return X
+
+
+# Function to compute the LU factorization P A = L U
+def lu_factor(A, block=64, dtype=float):
+    """
+    Blocked LU factorization with partial pivoting.
+    Returns (lu, perm, sign): L (unit lower) and U packed in one array,
+    the row permutation (A[perm] = L U) and the sign of the permutation.
+    """
+    lu = np.array(A, dtype=dtype)
+    if lu.ndim != 2 or lu.shape[0] != lu.shape[1]:
+        raise ValueError("Matrix must be square.")
+    n = lu.shape[0]
+    perm = np.arange(n)
+    sign = 1
+    for k0 in range(0, n, block):
+        k1 = min(k0 + block, n)
+        # Factor the panel column by column
+        for k in range(k0, k1):
+            p = k + int(np.argmax(np.abs(lu[k:, k])))
+            if p != k:
+                lu[[k, p]] = lu[[p, k]]
+                perm[[k, p]] = perm[[p, k]]
+                sign = -sign
+            if lu[k, k] != 0:
+                lu[k + 1:, k] /= lu[k, k]
+            lu[k + 1:, k + 1:k1] -= np.outer(lu[k + 1:, k], lu[k, k + 1:k1])
+        # Update the trailing matrix with one matrix product per panel
+        if k1 < n:
+            lu[k0:k1, k1:] = solve_triangular(lu[k0:k1, k0:k1], lu[k0:k1, k1:],
+                                              lower=True, unit_diagonal=True)
+            lu[k1:, k1:] -= lu[k1:, k0:k1] @ lu[k0:k1, k1:]
+    return lu, perm, sign
+
+
+# Function to solve A x = b from a stored factorization
+def lu_solve(factors, b):
+    """Solve A x = b (b may hold several right-hand sides as columns)."""
+    lu, perm = factors[0], factors[1]
+    y = solve_triangular(lu, np.asarray(b)[perm], lower=True, unit_diagonal=True)
+    return solve_triangular(lu, y)
+
+
+# Function to compute sign and natural log of |det(A)|
+def slogdet(A):
+    """Return (sign, logdet) so that det(A) = sign * exp(logdet) without overflow."""
+    lu, _, sign = lu_factor(A)
+    d = np.diag(lu)
+    if np.any(d == 0):
+        return 0.0, -np.inf
+    sign = sign * np.prod(np.sign(d))
+    return float(sign), float(np.sum(np.log(np.abs(d))))
+
+
+# Function to compute the determinant
+def det(A):
+    """Determinant as the signed product of the pivots of U."""
+    lu, _, sign = lu_factor(A)
+    if lu.shape[0] == 0:
+        return 1.0
+    return float(sign * np.prod(np.diag(lu)))
+
+
+# Function to check whether every entry is an integer
+def is_integer_matrix(A):
+    A = np.asarray(A)
+    if A.dtype == object:
+        return all(isinstance(v, (int, np.integer)) for v in A.flat)
+    return np.issubdtype(A.dtype, np.integer)
+
+
+# ---------------- Exact integer determinants ----------------
+
+# Function to compute an exact determinant with fraction-free (Bareiss) elimination
+def det_bareiss(A):
+    """Exact determinant of an integer matrix; every division is exact."""
+    M = np.array([[int(v) for v in row] for row in A], dtype=object)
+    n = M.shape[0]
+    if n == 0:
+        return 1
+    sign = 1
+    prev = 1
+    for k in range(n - 1):
+        if M[k, k] == 0:
+            nonzero = np.nonzero(M[k + 1:, k] != 0)[0]
+            if len(nonzero) == 0:
+                return 0
+            p = k + 1 + nonzero[0]
+            M[[k, p]] = M[[p, k]]
+            sign = -sign
+        M[k + 1:, k + 1:] = (M[k + 1:, k + 1:] * M[k, k]
+                             - np.outer(M[k + 1:, k], M[k, k + 1:])) // prev
+        prev = M[k, k]
+    return sign * int(M[n - 1, n - 1])
+
+
+# Function to check primality (deterministic Miller-Rabin for n < 3.4e14)
+def _is_prime(n):
+    if n < 2:
+        return False
+    for p in (2, 3, 5, 7, 11, 13, 17):
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in (2, 3, 5, 7, 11, 13, 17):
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+# Function to list primes just below a limit
+def _primes_below(limit, count):
+    primes = []
+    p = limit - 1
+    while len(primes) < count:
+        if _is_prime(p):
+            primes.append(p)
+        p -= 2 if p % 2 else 1
+    return primes
+
+
+# Primes stay below 2^21: a product is < 2^42, so dot products of up to
+# 2048 terms are still exact in float64 and the updates can go through BLAS.
+PRIME_LIMIT = 2 ** 21
+LIMB_BITS = 20
+
+
+# Function to split integer entries into signed 20-bit limbs -> (L, n, n)
+# (done once, then reused for every prime)
+def _to_limbs(A):
+    rows = [[int(v) for v in row] for row in A]
+    n = len(rows)
+    flat = [v for row in rows for v in row]
+    width = max([abs(v).bit_length() for v in flat] + [1]) // LIMB_BITS + 1
+    limbs = np.zeros((width, len(flat)))
+    mask = (1 << LIMB_BITS) - 1
+    for idx, v in enumerate(flat):
+        a, j = abs(v), 0
+        while a:
+            limbs[j, idx] = a & mask if v > 0 else -(a & mask)
+            a >>= LIMB_BITS
+            j += 1
+    return limbs.reshape(width, n, n)
+
+
+# Function to reduce the limb representation modulo a vector of primes -> (P, n, n)
+def _reduce_mod(limbs, primes):
+    width, n, _ = limbs.shape
+    weights = np.ones((len(primes), width))
+    for j in range(1, width):
+        weights[:, j] = np.mod(weights[:, j - 1] * 2.0 ** LIMB_BITS, primes)
+    # Every partial sum stays below 2^53, so one matrix product is exact
+    reduced = (weights @ limbs.reshape(width, -1)).reshape(len(primes), n, n)
+    return np.mod(reduced, primes[:, None, None])
+
+
+# Function to compute det(M[i]) mod primes[i] for a stack of reduced matrices.
+# Blocked elimination in exact float64 arithmetic, vectorized over the primes.
+# Reductions are delayed: the trailing block is only reduced when it becomes
+# the next panel, which stays exact while n * p^2 < 2^53 (n <= 2048).
+def _det_mod_stack(M, primes, block=32):
+    P, n, _ = M.shape
+    if n > 2048:
+        raise ValueError("Modular determinant supports n <= 2048.")
+    p1 = primes[:, None]
+    p3 = primes[:, None, None]
+    plist = [int(p) for p in primes]
+    rows = np.arange(P)
+    d = np.ones(P)
+    alive = np.ones(P, dtype=bool)
+    for k0 in range(0, n, block):
+        k1 = min(k0 + block, n)
+        M[:, k0:, k0:k1] = np.mod(M[:, k0:, k0:k1], p3)
+        for k in range(k0, k1):
+            M[:, k:, k] = np.mod(M[:, k:, k], p1)
+            column = M[:, k:, k] != 0
+            alive &= column.any(axis=1)
+            r = k + np.argmax(column, axis=1)
+            swap = r != k
+            if np.any(swap):
+                top = M[rows, k].copy()
+                M[rows, k] = M[rows, r]
+                M[rows, r] = top
+                d[swap] = primes[swap] - d[swap]
+            pivot = np.where(alive, M[:, k, k], 1.0)
+            d = np.mod(d * pivot, primes)
+            inv = np.array([pow(int(a), q - 2, q) for a, q in zip(pivot, plist)], dtype=float)
+            # Column of L and the pivot row are reduced; the panel update is not
+            M[:, k + 1:, k] = np.mod(M[:, k + 1:, k] * inv[:, None], p1)
+            M[:, k, k + 1:k1] = np.mod(M[:, k, k + 1:k1], p1)
+            M[:, k + 1:, k + 1:k1] -= M[:, k + 1:, k, None] * M[:, k, None, k + 1:k1]
+        if k1 < n:
+            # U12 = L11^{-1} A12 (unit lower triangular), then A22 -= L21 U12
+            M[:, k0, k1:] = np.mod(M[:, k0, k1:], p1)
+            for i in range(k0 + 1, k1):
+                M[:, i, k1:] = np.mod(
+                    M[:, i, k1:] - (M[:, i, None, k0:i] @ M[:, k0:i, k1:])[:, 0], p1)
+            M[:, k1:, k1:] -= M[:, k1:, k0:k1] @ M[:, k0:k1, k1:]
+    return [int(v) if a else 0 for v, a in zip(d, alive)]
+
+
+# Function to compute det(A) mod p for an integer matrix
+def det_mod_p(A, p):
+    return _det_mod_primes(_to_limbs(A), [p])[0]
+
+
+def _det_mod_primes(limbs, primes):
+    primes = np.array(primes, dtype=float)
+    return _det_mod_stack(_reduce_mod(limbs, primes), primes)
+
+
+# Function to bound |det(A)| (Hadamard's inequality) in bits
+def _hadamard_bits(rows):
+    bits = 0
+    for row in rows:
+        bits += (sum(v * v for v in row).bit_length() + 1) // 2
+    return bits + 1
+
+
+# Function to compute an exact determinant from residues with the Chinese remainder theorem
+def det_modular(A, workers=None, chunk=64):
+    """
+    Exact determinant of an integer matrix: det mod many ~21-bit primes
+    (in parallel worker processes) rebuilt with the CRT.
+    """
+    rows = [[int(v) for v in row] for row in A]
+    n = len(rows)
+    if n == 0:
+        return 1
+    bits = _hadamard_bits(rows) + 1  # one extra bit for the sign
+    primes = _primes_below(PRIME_LIMIT, bits // 20 + 1)
+    limbs = _to_limbs(rows)
+    batches = [primes[i:i + chunk] for i in range(0, len(primes), chunk)]
+    if workers == 1 or len(batches) == 1:
+        residues = [r for b in batches for r in _det_mod_primes(limbs, b)]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_det_mod_primes, [limbs] * len(batches), batches)
+            residues = [r for res in results for r in res]
+    # Garner-style incremental CRT
+    x, modulus = 0, 1
+    for r, p in zip(residues, primes):
+        t = (r - x) % p * pow(modulus % p, p - 2, p) % p
+        x += modulus * t
+        modulus *= p
+    if x > modulus // 2:
+        x -= modulus
+    return x
+
+
+# Function to compute an exact integer determinant
+def det_exact(A, method="auto", workers=None):
+    """Exact determinant: 'bareiss', 'modular', or 'auto' (Bareiss for small n)."""
+    if method == "auto":
+        method = "bareiss" if len(A) <= 80 else "modular"
+    if method == "bareiss":
+        return det_bareiss(A)
+    if method == "modular":
+        return det_modular(A, workers=workers)
+    raise ValueError(f"Unknown method: {method}")
@@ -0,0 +1,55 @@
+# Batched matrix inverse by Gauss-Jordan elimination with partial pivoting.
+# Works on one (n, n) matrix or a stack (N, n, n); the only Python loop is
+# over the n pivot columns, never over the N matrices.
+import numpy as np
+
+
+# Function to invert a matrix or a stack of matrices
+def inv(A, tol=None):
+    """
+    Returns (X, singular): X has the same shape as A and `singular` holds the
+    indices of the members whose pivot fell below tol (their X is NaN).
+    tol defaults to n * eps * max|A_i| for each member.
+    """
+    A = np.asarray(A, dtype=float)
+    single = A.ndim == 2
+    if single:
+        A = A[None]
+    if A.ndim != 3 or A.shape[1] != A.shape[2]:
+        raise ValueError("Expected an (n, n) matrix or an (N, n, n) stack.")
+    N, n, _ = A.shape
+    if N == 0 or n == 0:
+        X = A.copy()
+        return (X[0] if single else X), np.array([], dtype=int)
+
+    # Augmented stack [A | I]
+    M = np.empty((N, n, 2 * n))
+    M[:, :, :n] = A
+    M[:, :, n:] = np.eye(n)
+    if tol is None:
+        tol = n * np.finfo(float).eps * np.abs(A).max(axis=(1, 2))
+    tol = np.broadcast_to(np.asarray(tol, dtype=float), (N,))
+
+    batch = np.arange(N)
+    bad = np.zeros(N, dtype=bool)
+    for k in range(n):
+        # Partial pivoting, one pivot row per matrix
+        p = k + np.argmax(np.abs(M[:, k:, k]), axis=1)
+        top = M[batch, k].copy()
+        M[batch, k] = M[batch, p]
+        M[batch, p] = top
+
+        pivot = M[:, k, k]
+        small = np.abs(pivot) <= tol
+        bad |= small
+        M[:, k] /= np.where(small, 1.0, pivot)[:, None]
+
+        # Eliminate column k from every other row
+        factors = M[:, :, k].copy()
+        factors[:, k] = 0.0
+        M -= factors[:, :, None] * M[:, k, None, :]
+
+    X = M[:, :, n:]
+    X[bad] = np.nan
+    singular = np.nonzero(bad)[0]
+    return (X[0] if single else X), singular
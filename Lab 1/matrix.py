@@ -0,0 +1,162 @@
+# Compact matrix type backed by one flat buffer.
+# Element (i, j) lives at data[roff[i] + coff[j]], so a transpose is a swap of
+# the two offset tables and a minor just skips one entry in each: views share
+# the buffer and nothing is copied.
+from array import array
+
+import numpy as np
+
+
+# Index sequence with one position left out (used for minors, no copy)
+class _Skip:
+    __slots__ = ("base", "k")
+
+    def __init__(self, base, k):
+        self.base = base
+        self.k = k
+
+    def __len__(self):
+        return len(self.base) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("index out of range")
+        return self.base[i if i < self.k else i + 1]
+
+
+# One row or column of a Matrix (a 1-D view that behaves like a list)
+class _Line:
+    __slots__ = ("_data", "_start", "_offsets")
+
+    def __init__(self, data, start, offsets):
+        self._data = data
+        self._start = start
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, j):
+        if isinstance(j, slice):
+            return _Line(self._data, self._start, self._offsets[j])
+        return self._data[self._start + self._offsets[j]]
+
+    def __setitem__(self, j, value):
+        self._data[self._start + self._offsets[j]] = value
+
+    def __iter__(self):
+        data, start = self._data, self._start
+        for off in self._offsets:
+            yield data[start + off]
+
+    def __eq__(self, other):
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def tolist(self):
+        return list(self)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+# Function to pick the flat storage for a list of rows
+def _flat_buffer(flat):
+    if all(type(v) is int for v in flat):
+        try:
+            return array("q", flat)
+        except OverflowError:
+            return flat
+    if all(type(v) in (int, float) for v in flat):
+        return array("d", flat)
+    return flat  # strings or other objects
+
+
+class Matrix:
+    """Matrix view over a flat array / NumPy buffer; see minor(), T, row(), col()."""
+    __slots__ = ("_data", "_roff", "_coff")
+
+    def __init__(self, data, roff, coff):
+        self._data = data
+        self._roff = roff
+        self._coff = coff
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Copy a list of lists (or wrap a 2-D NumPy array) into one flat buffer."""
+        if isinstance(rows, Matrix):
+            return rows
+        if isinstance(rows, np.ndarray):
+            m, n = rows.shape
+            return cls(np.ascontiguousarray(rows).reshape(-1), range(0, m * n, n), range(n))
+        m = len(rows)
+        n = len(rows[0]) if m else 0
+        if any(len(row) != n for row in rows):
+            raise ValueError("All rows must have the same length.")
+        flat = _flat_buffer([v for row in rows for v in row])
+        return cls(flat, range(0, m * n, n), range(n))
+
+    @property
+    def shape(self):
+        return len(self._roff), len(self._coff)
+
+    def __len__(self):
+        return len(self._roff)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            i, j = key
+            return self._data[self._roff[i] + self._coff[j]]
+        if isinstance(key, slice):
+            return Matrix(self._data, self._roff[key], self._coff)
+        return self.row(key)
+
+    def __setitem__(self, key, value):
+        i, j = key
+        self._data[self._roff[i] + self._coff[j]] = value
+
+    def __iter__(self):
+        for start in self._roff:
+            yield _Line(self._data, start, self._coff)
+
+    def row(self, i):
+        return _Line(self._data, self._roff[i], self._coff)
+
+    def col(self, j):
+        return _Line(self._data, self._coff[j], self._roff)
+
+    @property
+    def T(self):
+        return Matrix(self._data, self._coff, self._roff)
+
+    def minor(self, i, j):
+        """Matrix without row i and column j (a view, no copy)."""
+        return Matrix(self._data, _Skip(self._roff, i), _Skip(self._coff, j))
+
+    def is_symmetric(self):
+        n, m = self.shape
+        if n != m:
+            return False
+        return all(self[i, j] == self[j, i] for i in range(n) for j in range(i + 1, n))
+
+    def __eq__(self, other):
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def tolist(self):
+        if isinstance(self._data, np.ndarray):
+            return [[v.item() for v in row] for row in self]
+        return [list(row) for row in self]
+
+    def __array__(self, dtype=None, copy=None):
+        return np.array(self.tolist(), dtype=dtype)
+
+    def __repr__(self):
+        return f"Matrix({self.tolist()!r})"
+
+
+# Function to view a list of lists / array as a Matrix (no copy if it already is one)
+def as_matrix(rows):
+    return Matrix.from_rows(rows)
@@ -0,0 +1,104 @@
+# Transpose routines for large (string) matrices, as read in Lab_1_Q3.
+#   transpose_inplace  - square list of lists or NumPy array, no second matrix
+#   blocked_transpose  - tiled copy for NumPy object / fixed-width string arrays
+#   transpose_file     - delimited file larger than RAM, tiles kept on disk
+import csv
+import json
+import os
+import tempfile
+from itertools import islice
+
+import numpy as np
+
+
+# Function to transpose a square matrix in place
+def transpose_inplace(a, block=64):
+    """Swap a[i][j] and a[j][i] for a square list of lists or NumPy array."""
+    n = len(a)
+    if isinstance(a, np.ndarray):
+        if a.ndim != 2 or a.shape[0] != a.shape[1]:
+            raise ValueError("Matrix must be square.")
+        # Swap pairs of tiles across the diagonal so each tile stays in cache
+        for i0 in range(0, n, block):
+            i1 = min(i0 + block, n)
+            a[i0:i1, i0:i1] = a[i0:i1, i0:i1].T.copy()
+            for j0 in range(i1, n, block):
+                j1 = min(j0 + block, n)
+                upper = a[i0:i1, j0:j1].copy()
+                a[i0:i1, j0:j1] = a[j0:j1, i0:i1].T
+                a[j0:j1, i0:i1] = upper.T
+        return a
+    if any(len(row) != n for row in a):
+        raise ValueError("Matrix must be square.")
+    for i in range(n):
+        row = a[i]
+        for j in range(i + 1, n):
+            row[j], a[j][i] = a[j][i], row[j]
+    return a
+
+
+# Function to transpose a NumPy array tile by tile
+def blocked_transpose(a, block=256):
+    """Return a.T as a new contiguous array, copied in block x block tiles."""
+    a = np.asarray(a)
+    m, n = a.shape
+    out = np.empty((n, m), dtype=a.dtype)
+    for i0 in range(0, m, block):
+        i1 = min(i0 + block, m)
+        for j0 in range(0, n, block):
+            j1 = min(j0 + block, n)
+            out[j0:j1, i0:i1] = a[i0:i1, j0:j1].T
+    return out
+
+
+# Function to transpose a delimited file that does not fit in memory
+def transpose_file(src, dst, delimiter=",", max_cells=1 << 22, tmpdir=None):
+    """
+    Two passes with at most about max_cells cells in memory:
+    1. read bands of rows, write each band transposed to one temporary file
+       (one JSON line per column, remembering where each band starts);
+    2. for a group of output rows, read the next lines of every band and
+       join them.
+    Returns the shape (rows, cols) of the transposed file.
+    """
+    fd, work = tempfile.mkstemp(suffix=".jsonl", dir=tmpdir)
+    os.close(fd)
+    try:
+        band_starts = []
+        n_rows = 0
+        n_cols = None
+        with open(src, newline="") as f, open(work, "w") as tmp:
+            reader = csv.reader(f, delimiter=delimiter)
+            first = next(reader, None)
+            if first is None:
+                open(dst, "w").close()
+                return 0, 0
+            n_cols = len(first)
+            band_rows = max(1, max_cells // max(n_cols, 1))
+            band = [first] + list(islice(reader, band_rows - 1))
+            while band:
+                if any(len(row) != n_cols for row in band):
+                    raise ValueError("All rows must have the same number of fields.")
+                band_starts.append(tmp.tell())
+                for column in zip(*band):
+                    tmp.write(json.dumps(column) + "\n")
+                n_rows += len(band)
+                band = list(islice(reader, band_rows))
+
+        # Every band holds n_cols lines; take `group` of them from each band at a time
+        group = max(1, max_cells // max(n_rows, 1))
+        positions = list(band_starts)
+        with open(work) as tmp, open(dst, "w", newline="") as out:
+            writer = csv.writer(out, delimiter=delimiter)
+            for g0 in range(0, n_cols, group):
+                count = min(group, n_cols - g0)
+                pieces = []
+                for b, pos in enumerate(positions):
+                    tmp.seek(pos)
+                    pieces.append([json.loads(tmp.readline()) for _ in range(count)])
+                    positions[b] = tmp.tell()
+                for k in range(count):
+                    writer.writerow([cell for piece in pieces for cell in piece[k]])
+        return n_cols, n_rows
+    finally:
+        os.remove(work)
@@ -1,49 +1,45 @@
 # Q2. Write a Python Program to find the inverse of a n*n matrix - Using adjoint method.
-# Function to get minor of element (i,j)
+import os
+import sys
+
+# The determinant, adjugate, inverse and Matrix modules live in Lab 1
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab 1"))
+import inversion
+from adjugate import adjugate
+from determinant import det, det_exact, is_integer_matrix
+from matrix import as_matrix
+
+# Function to get minor of element (i,j) (a view, no copy)
 def get_minor(matrix, i, j):
-    return [row[:j] + row[j+1:] for row in (matrix[:i] + matrix[i+1:])]
-    # Function to calculate determinant
-    def determinant(matrix):
-    n = len(matrix)
-    if n == 1:
-    return matrix[0][0]
-    if n == 2:
-    return matrix[0][0]*matrix[1][1] - matrix[0][1]*matrix[1][0]
-    det = 0
-    for col in range(n):
-    det += ((-1) ** col) * matrix[0][col] * determinant(get_minor(matrix, 0, col))
-    return det
-# Function to compute cofactor matrix
+    return as_matrix(matrix).minor(i, j)
+
+# Function to calculate determinant (exact for integers, LU otherwise; no cofactor recursion)
+def determinant(matrix):
+    if is_integer_matrix(matrix):
+        return det_exact(matrix)  # Bareiss / multi-modular, no rounding error
+    return det(matrix)
+
+# Function to compute cofactor matrix (transpose of the adjugate, one O(n^3) elimination)
 def cofactor_matrix(matrix):
-    n = len(matrix)
-    cofactors = []
-    for i in range(n):
-    cofactor_row = []
-    for j in range(n):
-    minor = get_minor(matrix, i, j)
+    return adjugate(matrix).T.tolist()
 
-    cofactor_row.append(((-1) ** (i+j)) * determinant(minor))
-    cofactors.append(cofactor_row)
-    return cofactors
-# Function to transpose matrix
+# Function to transpose matrix (a view, no copy)
 def transpose(matrix):
-    return [[matrix[j][i] for j in range(len(matrix))] for i in range(len(matrix))]
-# Function to compute inverse
+    return as_matrix(matrix).T
+
+# Function to compute inverse (Gauss-Jordan instead of dividing the adjoint, see inversion.py)
 def inverse_matrix(matrix):
     det = determinant(matrix)
     if det == 0:
-    raise ValueError("Matrix is singular! No inverse exists.")
-    cofactors = cofactor_matrix(matrix)
-    adjoint = transpose(cofactors)
-    n = len(matrix)
-    # Divide adjoint by determinant
-    inverse = []
-    for i in range(n):
-    row = []
-    for j in range(n):
-    row.append(adjoint[i][j] / det)
-    inverse.append(row)
-    return inverse
+        raise ValueError("Matrix is singular! No inverse exists.")
+    if is_integer_matrix(matrix):
+        # adj(A) and det(A) are exact here, so one division per entry is correctly rounded
+        return [[v / det for v in row] for row in adjugate(matrix).tolist()]
+    inverse, singular = inversion.inv(matrix)
+    if len(singular):
+        raise ValueError("Matrix is numerically singular! No inverse exists.")
+    return inverse.tolist()
+
 # Example
 A = [[2, 1, 3],
 [1, 2, 2],
@@ -0,0 +1,142 @@
+# Characteristic polynomial det(lambda I - A) as a coefficient vector.
+# Works on one n x n matrix or on a whole stack (..., n, n) at once: every
+# step is an array operation over the stack, so there is no Python loop over
+# the matrices, only over n.
+#   faddeev    - Faddeev-LeVerrier: n batched matrix products (fastest for
+#                small n, but rounding errors grow quickly with n)
+#   hessenberg - Householder reduction to upper Hessenberg form (a similarity,
+#                so the eigenvalues are unchanged), then an O(n^2) recurrence
+#                on the leading principal minors (stable, O(n^3))
+#   berkowitz  - division-free; with exact=True it runs on integers and
+#                gives the exact coefficients of an integer matrix
+import numpy as np
+
+METHODS = ("auto", "faddeev", "hessenberg", "berkowitz")
+
+# Matrices up to this order use Faddeev-LeVerrier in "auto" mode
+FADDEEV_MAX_N = 4
+
+
+# Function to compute the characteristic polynomial of one matrix or a stack of matrices
+def charpoly(A, method="auto", exact=False):
+    """
+    Returns c with det(lambda I - A) = c[0] lambda^n + c[1] lambda^(n-1) + ... + c[n],
+    c[0] = 1 (np.poly order); for a stack (..., n, n) the result is (..., n + 1).
+    exact=True: A must hold integers; the coefficients are exact Python ints
+    (object array), computed with Berkowitz in int64 when no intermediate can
+    overflow and in arbitrary precision otherwise.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}")
+    A = np.asarray(A)
+    if A.ndim < 2 or A.shape[-1] != A.shape[-2]:
+        raise ValueError("A must be a square matrix or a stack of square matrices.")
+    n = A.shape[-1]
+    if exact:
+        if method not in ("auto", "berkowitz"):
+            raise ValueError("exact=True uses the Berkowitz method.")
+        A = _as_integer(A)
+        amax = int(np.abs(A).max()) if A.size else 0
+        # Every intermediate is at most n 2^n (n max|a_ij|)^n in magnitude
+        if n * 2**n * (n * amax) ** n < 2**63:
+            return _berkowitz(A.astype(np.int64)).astype(object)
+        return _berkowitz(A.astype(object))
+    A = A.astype(float)
+    if method == "auto":
+        method = "faddeev" if n <= FADDEEV_MAX_N else "hessenberg"
+    if method == "faddeev":
+        return _faddeev(A)
+    if method == "hessenberg":
+        return _hessenberg_charpoly(hessenberg(A))
+    return _berkowitz(A)
+
+
+# Function to accept integer input (integer dtype, Python ints or integral floats)
+def _as_integer(A):
+    if A.dtype == object:
+        if not all(isinstance(v, (int, np.integer)) for v in A.flat):
+            raise ValueError("exact=True needs an integer matrix.")
+        return np.vectorize(int, otypes=[object])(A) if A.size else A
+    if np.issubdtype(A.dtype, np.integer):
+        return A
+    if np.issubdtype(A.dtype, np.floating) and np.all(np.isfinite(A)) and np.all(A == np.round(A)):
+        return np.vectorize(int, otypes=[object])(A) if A.size else A.astype(np.int64)
+    raise ValueError("exact=True needs an integer matrix.")
+
+
+def _faddeev(A):
+    """M_1 = I, c_k = -tr(A M_k) / k, M_(k+1) = A M_k + c_k I."""
+    n = A.shape[-1]
+    c = np.zeros(A.shape[:-2] + (n + 1,))
+    c[..., 0] = 1.0
+    I = np.eye(n)
+    M = np.broadcast_to(I, A.shape)
+    for k in range(1, n + 1):
+        AM = A @ M
+        c[..., k] = -np.trace(AM, axis1=-2, axis2=-1) / k
+        M = AM + c[..., k, None, None] * I
+    return c
+
+
+# Function to reduce a matrix (or stack) to upper Hessenberg form by Householder similarity
+def hessenberg(A):
+    """H = Q^T A Q with H[i, j] = 0 for i > j + 1; the entries below the subdiagonal are set to 0."""
+    H = np.array(A, dtype=float)
+    n = H.shape[-1]
+    for k in range(n - 2):
+        x = H[..., k + 1:, k]
+        norm = np.linalg.norm(x, axis=-1)
+        v = x.copy()
+        v[..., 0] += np.where(x[..., 0] < 0, -norm, norm)  # x + sign(x_0) ||x|| e_1: no cancellation
+        vnorm = np.linalg.norm(v, axis=-1, keepdims=True)
+        v = np.divide(v, vnorm, out=np.zeros_like(v), where=vnorm > 0)  # column already reduced: v = 0
+        H[..., k + 1:, :] -= 2.0 * v[..., :, None] * (v[..., None, :] @ H[..., k + 1:, :])
+        H[..., :, k + 1:] -= 2.0 * (H[..., :, k + 1:] @ v[..., :, None]) * v[..., None, :]
+        H[..., k + 2:, k] = 0.0
+    return H
+
+
+def _hessenberg_charpoly(H):
+    """
+    p_0 = 1, p_(m+1) = (lambda - h_mm) p_m
+                       - sum_i h_(m-i),m (h_(m,m-1) ... h_(m-i+1,m-i)) p_(m-i),
+    p_m the characteristic polynomial of the leading m x m block.
+    """
+    n = H.shape[-1]
+    # P[..., m, d] = coefficient of lambda^d in p_m
+    P = np.zeros(H.shape[:-2] + (n + 1, n + 1))
+    P[..., 0, 0] = 1.0
+    for m in range(n):
+        P[..., m + 1, 1:] = P[..., m, :-1]
+        P[..., m + 1, :] -= H[..., m, m, None] * P[..., m, :]
+        prod = np.ones(H.shape[:-2])
+        for i in range(1, m + 1):
+            prod = prod * H[..., m - i + 1, m - i]
+            P[..., m + 1, :] -= (H[..., m - i, m] * prod)[..., None] * P[..., m - i, :]
+    return P[..., n, ::-1].copy()
+
+
+def _berkowitz(A):
+    """
+    Division-free: p_r = T_r p_(r-1) for the leading (r+1) x (r+1) blocks, with
+    T_r lower-triangular Toeplitz with first column
+    (1, -a_rr, -R C, -R A_r C, ..., -R A_r^(r-1) C), where R, C are the row and
+    column that border the r x r block A_r. Uses only +, - and *.
+    """
+    n = A.shape[-1]
+    batch = A.shape[:-2]
+    p = np.ones(batch + (1,), dtype=A.dtype)
+    for r in range(n):
+        R, C, sub = A[..., r, :r], A[..., :r, r], A[..., :r, :r]
+        t = np.zeros(batch + (r + 2,), dtype=A.dtype)
+        t[..., 0] = 1
+        t[..., 1] = -A[..., r, r]
+        q = C
+        for j in range(r):
+            t[..., j + 2] = -np.sum(R * q, axis=-1)
+            q = np.matmul(sub, q[..., None])[..., 0]
+        new = np.zeros(batch + (r + 2,), dtype=A.dtype)
+        for j in range(r + 1):
+            new[..., j:] += t[..., :r + 2 - j] * p[..., j:j + 1]
+        p = new
+    return p
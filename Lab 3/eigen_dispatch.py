@@ -0,0 +1,169 @@
+# Structure-aware eigenvalue dispatch.
+# A cheap O(n^2) scan classifies A (or every matrix of a stack (..., n, n)):
+#   diagonal             - eigenvalues are the diagonal, eigenvectors e_i
+#   upper / lower triangular - eigenvalues are the diagonal, eigenvectors by
+#                          back substitution
+#   symmetric / hermitian - eigh (real output); closed form for 3 x 3
+#                          (eigh3.py); Lanczos (Lab 8) for the largest
+#                          eigenvalue alone of a large matrix
+#   general              - eig (real output when every eigenvalue is real)
+# Every result names the path it took.
+import os
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from eigh3 import eigh3
+
+# The Lanczos solver lives in Lab 8
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab 8"))
+from eigen import lanczos
+
+EigResult = namedtuple("EigResult", ["values", "vectors", "path"])
+LargestEig = namedtuple("LargestEig", ["value", "vector", "path"])
+
+# Symmetric matrices at least this large use Lanczos when only the largest eigenvalue is wanted
+LANCZOS_MIN_N = 300
+
+
+# Function to classify a matrix (or a stack): diagonal, triangular, symmetric/hermitian or general
+def detect_structure(A, tol=0.0):
+    """
+    Returns "diagonal", "upper triangular", "lower triangular", "symmetric",
+    "hermitian" or "general". Entries with |a_ij| <= tol * max|a| count as zero
+    (and as equal for symmetry); the default tol=0 asks for exact structure.
+    """
+    A = np.asarray(A)
+    if A.ndim < 2 or A.shape[-1] != A.shape[-2]:
+        raise ValueError("A must be a square matrix or a stack of square matrices.")
+    eps = tol * (np.abs(A).max() if A.size else 0.0)
+    upper = np.all(np.abs(np.tril(A, -1)) <= eps)
+    lower = np.all(np.abs(np.triu(A, 1)) <= eps)
+    if upper and lower:
+        return "diagonal"
+    if upper:
+        return "upper triangular"
+    if lower:
+        return "lower triangular"
+    if np.all(np.abs(A - np.conj(np.swapaxes(A, -1, -2))) <= eps):
+        return "hermitian" if np.iscomplexobj(A) else "symmetric"
+    return "general"
+
+
+# Function to compute all eigenvalues (and eigenvectors) through the fastest correct kernel
+def eig(A, vectors=True, tol=0.0):
+    """
+    Returns EigResult(values, vectors or None, path). Real eigenvalues come
+    back ascending with matching eigenvector columns (as np.linalg.eigh);
+    complex ones in np.linalg.eig order.
+    """
+    A = _as_array(A)
+    structure = detect_structure(A, tol)
+    n = A.shape[-1]
+    if structure == "diagonal":
+        d = np.diagonal(A, axis1=-2, axis2=-1)
+        order = np.argsort(d.real if np.iscomplexobj(d) else d, axis=-1)
+        values = np.take_along_axis(d, order, axis=-1)
+        V = np.swapaxes(np.eye(n)[order], -1, -2) if vectors else None
+        return EigResult(values, V, "diagonal: read off")
+    if structure.endswith("triangular"):
+        d = np.diagonal(A, axis1=-2, axis2=-1)
+        if not vectors:
+            return EigResult(_sorted(d), None, f"{structure}: read off")
+        if _distinct(d):
+            return EigResult(*_sorted(d, _triangular_vectors(A, structure == "upper triangular")),
+                             f"{structure}: read off + back substitution")
+        structure += " (repeated diagonal)"
+    elif structure in ("symmetric", "hermitian"):
+        if structure == "symmetric" and n == 3:
+            w, V = eigh3(A, "all" if vectors else None)
+            return EigResult(w, V, f"{structure}: eigh3 (closed form)")
+        if vectors:
+            w, V = np.linalg.eigh(A)
+            return EigResult(w, V, f"{structure}: eigh")
+        return EigResult(np.linalg.eigvalsh(A), None, f"{structure}: eigvalsh")
+    if vectors:
+        w, V = np.linalg.eig(A)
+    else:
+        w, V = np.linalg.eigvals(A), None
+    if np.all(w.imag == 0):
+        w = w.real
+        V = None if V is None else V.real
+        return EigResult(*_sorted(w, V), f"{structure}: eig (real spectrum)")
+    return EigResult(w, V, f"{structure}: eig")
+
+
+# Function to find the largest (by real part) eigenvalue and its eigenvector
+def largest_eig(A, tol=0.0):
+    """
+    Like eig() but only the largest eigenvalue: symmetric 3 x 3 uses the closed
+    form, a single symmetric matrix with n >= LANCZOS_MIN_N uses Lanczos
+    (residual 1e-10), everything else the eig() path. Returns
+    LargestEig(value, vector, path).
+    """
+    A = _as_array(A)
+    n = A.shape[-1]
+    structure = detect_structure(A, tol)
+    if structure == "symmetric" and A.ndim == 2 and n >= LANCZOS_MIN_N:
+        result = lanczos(A, 1, which="LA", tol=1e-10)
+        if result.converged:
+            return LargestEig(result.values[0], result.vectors[:, 0], f"{structure}: Lanczos (largest only)")
+    if structure == "symmetric" and n == 3:
+        w, v = eigh3(A)
+        return LargestEig(w[..., 2], v, f"{structure}: eigh3 (closed form)")
+    result = eig(A, True, tol)
+    w, V = result.values, result.vectors
+    k = np.argmax(w.real, axis=-1)
+    value = np.take_along_axis(w, k[..., None], axis=-1)[..., 0]
+    vector = np.take_along_axis(V, k[..., None, None], axis=-1)[..., 0]
+    return LargestEig(value, vector, result.path)
+
+
+def _as_array(A):
+    A = np.asarray(A)
+    if not np.iscomplexobj(A):
+        A = A.astype(float)
+    if A.ndim < 2 or A.shape[-1] != A.shape[-2] or A.shape[-1] == 0:
+        raise ValueError("A must be a nonempty square matrix or a stack of square matrices.")
+    return A
+
+
+# Function to check that the diagonal entries of every matrix are pairwise distinct
+def _distinct(d):
+    s = np.sort(d.real, axis=-1) if not np.iscomplexobj(d) else None
+    if s is not None:
+        return bool(np.all(np.diff(s, axis=-1) != 0))
+    return all(len(np.unique(row)) == len(row) for row in d.reshape(-1, d.shape[-1]))
+
+
+# Function to order real eigenvalues ascending (vector columns follow); complex ones are left as they are
+def _sorted(w, V=None):
+    if np.iscomplexobj(w):
+        return (w, V) if V is not None else w
+    order = np.argsort(w, axis=-1)
+    w = np.take_along_axis(w, order, axis=-1)
+    if V is None:
+        return w
+    return w, np.take_along_axis(V, order[..., None, :], axis=-1)
+
+
+def _triangular_vectors(T, upper):
+    """
+    Eigenvectors of a triangular matrix with distinct diagonal entries, as unit
+    columns. Upper T: column k has x_k = 1, x_j = 0 for j > k and, for i < k,
+    x_i = -(sum_j>i t_ij x_j) / (t_ii - t_kk), solved one row i at a time for
+    all k together. Lower T is reversed into an upper one.
+    """
+    if not upper:
+        T = T[..., ::-1, ::-1]
+    n = T.shape[-1]
+    d = np.diagonal(T, axis1=-2, axis2=-1)
+    X = np.zeros(T.shape, dtype=np.result_type(T.dtype, float))
+    X[..., n - 1, n - 1] = 1.0
+    for i in range(n - 2, -1, -1):
+        X[..., i, i] = 1.0
+        num = np.einsum("...j,...jk->...k", T[..., i, i + 1:], X[..., i + 1:, i + 1:])
+        X[..., i, i + 1:] = -num / (d[..., i, None] - d[..., i + 1:])
+    X /= np.linalg.norm(X, axis=-2, keepdims=True)
+    return X[..., ::-1, ::-1] if not upper else X
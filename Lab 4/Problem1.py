@@ -1,5 +1,8 @@
 import numpy as np
 
+from mixed_precision import mixed_solve  # float32 LU + iterative refinement
+from structured_solve import structured_solve  # picks the solver from the structure of A
+
 def solve_linear_equations():
     n = int(input("Enter number of equations/variables (n): "))  # Input number of equations/variables
     print("Enter the coefficients of matrix A row-wise:")
@@ -18,9 +21,18 @@ def solve_linear_equations():
     
     A = np.array(A, dtype=float)
     b = np.array(b, dtype=float)
+    mixed = input("Use mixed precision (float32 LU + refinement)? (y/n): ").strip().lower() == "y"
     
     try:
-        x = np.linalg.solve(A, b)
+        if mixed:
+            result = mixed_solve(A, b)
+            x = result.x
+            print(f"\n{result.precision}: {result.iterations} refinement steps, "
+                  f"backward error {result.residual:.2e}, condition estimate {result.condition:.2e}")
+        else:
+            result = structured_solve(A, b)
+            x = result.x
+            print(f"\nSolver path: {result.path}")
         print("\nSolution vector x:")
         for i, val in enumerate(x, 1):
             print(f"x{i} = {val:.4f}")
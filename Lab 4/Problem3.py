@@ -1,5 +1,7 @@
 import numpy as np
 
+from rank import tsqr_rank  # tall-skinny QR, then an SVD of the small R
+
 def matrix_rank():
     # Input number of rows and columns
     m, n = map(int, input("Enter number of rows and columns (m n): ").split())
@@ -16,8 +18,8 @@ def matrix_rank():
     # Convert to numpy array
     A = np.array(A, dtype=float)
     
-    # Find rank using numpy's linear algebra module
-    rank = np.linalg.matrix_rank(A)
+    # Find rank from the R factor of a tall-skinny QR (same singular values as A)
+    rank = tsqr_rank(A).rank
     
     # Display result
     print("\nRank of the matrix:", rank)
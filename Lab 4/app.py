@@ -1,6 +1,11 @@
 import streamlit as st
 import numpy as np
 
+from matrix_analysis import MatrixAnalysis  # rank, det, echelon form... from one elimination
+from mixed_precision import mixed_solve  # float32 LU + iterative refinement
+from solver_cache import default_cache  # factor once, solve many
+from structured_solve import structured_solve  # picks the solver from the structure of A
+
 # Set page configuration
 st.set_page_config(
     page_title="Math Problem Solver",
@@ -124,6 +129,9 @@ if problem_choice == "Linear Equations Solver":
             )
             b_vector.append(b_val)
     
+    mixed = st.checkbox("Mixed precision (float32 LU + refinement)",
+                        help="Factor A in single precision and refine the solution to double precision")
+    
     if st.button("Solve Linear Equations", type="primary"):
         if len(A_matrix) == n and len(b_vector) == n:
             try:
@@ -138,8 +146,23 @@ if problem_choice == "Linear Equations Solver":
                     eq_text += f"Equation {i+1}: " + " + ".join(terms) + f" = {b[i]:.2f}\n"
                 st.text(eq_text)
                 
-                # Solve the system
-                x = np.linalg.solve(A, b)
+                if mixed:
+                    # float32 LU, refined in float64 (float64 LU if A is too ill-conditioned)
+                    result = mixed_solve(A, b)
+                    x = result.x
+                    st.caption(f"{result.precision}: {result.iterations} refinement steps, "
+                               f"backward error {result.residual:.2e}, "
+                               f"condition estimate {result.condition:.2e}")
+                else:
+                    # Solve through the path that fits A (a general LU is reused if A was solved before)
+                    lookups = default_cache.hits + default_cache.misses
+                    result = structured_solve(A, b, cache=default_cache)
+                    x = result.x
+                    st.caption(f"Solver path: {result.path}")
+                    if default_cache.hits + default_cache.misses > lookups:
+                        info = default_cache.cache_info()
+                        st.caption(f"LU cache: {info.hits} hits, {info.misses} misses, "
+                                   f"{info.size}/{info.maxsize} factorizations stored")
                 
                 # Display results
                 st.markdown('<div class="result-box">', unsafe_allow_html=True)
@@ -344,8 +367,9 @@ elif problem_choice == "Matrix Rank Calculator":
                 st.subheader("Input Matrix")
                 st.write(A)
                 
-                # Calculate rank
-                rank = np.linalg.matrix_rank(A)
+                # One elimination pass gives rank, determinant, echelon form and null space
+                analysis = MatrixAnalysis(A)
+                rank = analysis.rank
                 
                 st.markdown('<div class="result-box">', unsafe_allow_html=True)
                 
@@ -359,8 +383,7 @@ elif problem_choice == "Matrix Rank Calculator":
                 
                 with col3:
                     if m == n:
-                        det = np.linalg.det(A)
-                        st.metric("Determinant", f"{det:.6f}")
+                        st.metric("Determinant", f"{analysis.det:.6f}")
                     else:
                         st.metric("Determinant", "N/A")
                 
@@ -368,20 +391,21 @@ elif problem_choice == "Matrix Rank Calculator":
                 with st.expander("Show Detailed Analysis"):
                     st.write(f"**Rank:** {rank}")
                     st.write(f"**Shape:** ({int(m)}, {int(n)})")
-                    st.write(f"**Full rank?:** {'Yes' if rank == min(m, n) else 'No'}")
+                    st.write(f"**Full rank?:** {'Yes' if analysis.full_rank else 'No'}")
                     
                     if m == n:
-                        st.write(f"**Determinant:** {np.linalg.det(A):.6f}")
-                        st.write(f"**Is singular?:** {'Yes' if np.abs(np.linalg.det(A)) < 1e-10 else 'No'}")
+                        st.write(f"**Determinant:** {analysis.det:.6f}")
+                        st.write(f"**Is singular?:** {'Yes' if analysis.is_singular else 'No'}")
+                        st.write(f"**Condition number (1-norm):** {analysis.condition_number:.6g}")
                     
-                    # Calculate and show row echelon form
-                    st.write("\n**Row Echelon Form:**")
-                    try:
-                        from scipy import linalg
-                        U = linalg.lu(A)[2]  # Get upper triangular matrix from LU decomposition
-                        st.write(U)
-                    except:
-                        st.write("Cannot compute row echelon form")
+                    # Show the reduced row echelon form
+                    st.write("\n**Reduced Row Echelon Form:**")
+                    st.write(analysis.echelon.matrix)
+                    st.write(f"**Pivot columns:** {[p + 1 for p in analysis.pivots]}")
+                    if rank < n:
+                        st.write("**Null space basis (columns):**")
+                        st.write(analysis.null_space)
+                    st.caption(f"O(n³) factorizations for this analysis: {analysis.factorizations}")
                 
                 st.markdown('</div>', unsafe_allow_html=True)
                 
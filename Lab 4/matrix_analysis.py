@@ -0,0 +1,88 @@
+# Everything the rank panel shows, from one elimination.
+# MatrixAnalysis runs Gauss-Jordan on [A | I] (rref.py) the first time any
+# property is read and derives the rest from that single pass: rank, pivots,
+# echelon form, null space, determinant, singularity and - since E = A^-1 for
+# a nonsingular square A - the exact 1-norm condition number. Every property
+# is cached, so reading it again costs nothing. An SVD is computed only if the
+# singular values themselves are asked for.
+from functools import cached_property
+
+import numpy as np
+
+from rref import null_space, rref
+
+
+class MatrixAnalysis:
+    """
+    Lazy analysis of A. tol and exact are passed to rref(); factorizations
+    counts the O(n^3) passes done so far (1 after any elimination property,
+    2 once singular_values has been read).
+    """
+
+    def __init__(self, A, tol=None, exact=False):
+        self.A = np.array(A, dtype=object if exact else float)
+        if self.A.ndim != 2:
+            raise ValueError("A must be a 2-D matrix.")
+        self.tol = tol
+        self.exact = exact
+        self.factorizations = 0
+
+    @property
+    def shape(self):
+        return self.A.shape
+
+    @property
+    def is_square(self):
+        return self.A.shape[0] == self.A.shape[1]
+
+    @cached_property
+    def echelon(self):
+        """RREFResult of A (the one elimination pass)."""
+        self.factorizations += 1
+        return rref(self.A, self.tol, self.exact)
+
+    @property
+    def rank(self):
+        return self.echelon.rank
+
+    @property
+    def pivots(self):
+        return self.echelon.pivots
+
+    @property
+    def full_rank(self):
+        return self.rank == min(self.shape)
+
+    @property
+    def det(self):
+        """det(A) for square A (product of the pivots), else None."""
+        return self.echelon.det
+
+    @property
+    def is_singular(self):
+        """Square A with rank < n (pivots below tol), else None."""
+        return self.rank < self.shape[0] if self.is_square else None
+
+    @cached_property
+    def null_space(self):
+        return null_space(self.echelon)
+
+    @cached_property
+    def inverse(self):
+        """E from the elimination when A is square and nonsingular, else None."""
+        return self.echelon.transform if self.is_square and not self.is_singular else None
+
+    @cached_property
+    def condition_number(self):
+        """||A||_1 ||A^-1||_1 (inf if singular, None if not square)."""
+        if not self.is_square:
+            return None
+        if self.is_singular:
+            return np.inf
+        norm = lambda M: np.abs(np.asarray(M, dtype=float)).sum(axis=0).max()
+        return norm(self.A) * norm(self.inverse)
+
+    @cached_property
+    def singular_values(self):
+        self.factorizations += 1
+        return np.linalg.svd(np.asarray(self.A, dtype=float), compute_uv=False)
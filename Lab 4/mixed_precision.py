@@ -0,0 +1,111 @@
+# Mixed-precision solve of A x = b with iterative refinement.
+# A is factored in float32 (half the memory of float64, and the O(n^3)
+# update runs at single-precision BLAS speed); the accuracy lost in the
+# factorization is then recovered by refinement steps, each O(n^2):
+#   r = b - A x (float64),  A d = r with the float32 factors,  x += d.
+# This converges to float64 accuracy when cond(A) * u32 < 1 (u32 = 2^-24).
+# A 1-norm condition estimate (Hager / Higham) from the same factors decides
+# beforehand whether that holds; if not, A is factored again in float64.
+import os
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+# The LU factorization lives in Lab 1
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab 1"))
+from determinant import lu_factor, lu_solve, solve_triangular
+
+RefinementResult = namedtuple("RefinementResult",
+                              ["x", "iterations", "residual", "converged", "condition", "precision"])
+
+
+# Function to factor A in the given precision (raises LinAlgError on a zero pivot)
+def _factor(A, dtype):
+    lu, perm, _ = lu_factor(A, dtype=dtype)
+    if np.any(np.diag(lu) == 0) or not np.all(np.isfinite(lu)):
+        raise np.linalg.LinAlgError("Singular matrix")
+    return lu, perm
+
+
+# Function to solve A^T y = c from the LU factors of A (A[perm] = L U)
+def _solve_transposed(factors, c):
+    lu, perm = factors
+    z = solve_triangular(lu.T, c, lower=True)
+    w = solve_triangular(lu.T, z, unit_diagonal=True)
+    y = np.empty_like(w)
+    y[perm] = w
+    return y
+
+
+# Function to estimate the 1-norm condition number from LU factors (Hager's method, Higham's safeguard)
+def condition_estimate(A, factors, max_iter=5):
+    """
+    Estimates ||A^-1||_1 with a few solves with A and A^T (O(n^2) each), never
+    forming A^-1, and returns ||A||_1 times the estimate. The estimate is a
+    lower bound that is almost always within a factor of 3.
+    """
+    A = np.asarray(A, dtype=float)
+    n = A.shape[0]
+    dtype = factors[0].dtype
+    x = np.full(n, 1.0 / n, dtype=dtype)
+    est = 0.0
+    for _ in range(max_iter):
+        y = lu_solve(factors, x).astype(float)
+        est = np.abs(y).sum()
+        z = _solve_transposed(factors, np.where(y >= 0, 1.0, -1.0).astype(dtype)).astype(float)
+        j = int(np.argmax(np.abs(z)))
+        if np.abs(z[j]) <= z @ x:
+            break
+        x = np.zeros(n, dtype=dtype)
+        x[j] = 1.0
+    # Alternating test vector: catches the cases where the iteration stalls
+    alt = np.array([(-1) ** i * (1 + i / max(n - 1, 1)) for i in range(n)], dtype=dtype)
+    est = max(est, 2.0 * np.abs(lu_solve(factors, alt).astype(float)).sum() / (3.0 * n))
+    return np.abs(A).sum(axis=0).max() * est
+
+
+# Function to solve A x = b with a float32 LU and float64 iterative refinement
+def mixed_solve(A, b, max_iter=10, factor_dtype=np.float32):
+    """
+    Returns RefinementResult(x, iterations, residual, converged, condition,
+    precision). residual is the normwise backward error
+    ||b - A x||_inf / (||A||_inf ||x||_inf + ||b||_inf); refinement stops once it
+    is at most n * eps64 or stops decreasing. When the condition estimate
+    times the unit roundoff of factor_dtype is 0.1 or more, refinement is not
+    safe and A is factored in float64 instead (precision says which was used).
+    """
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    n = A.shape[0]
+    if A.shape != (n, n) or b.shape[0] != n:
+        raise ValueError("A must be n x n and b must have n entries.")
+    factors = _factor(A, factor_dtype)
+    condition = condition_estimate(A, factors)
+    precision = f"{np.dtype(factor_dtype).name} LU + refinement"
+    if condition * np.finfo(factor_dtype).eps / 2 >= 0.1:
+        factors = _factor(A, np.float64)
+        condition = condition_estimate(A, factors)
+        precision = "float64 LU (too ill-conditioned for refinement)"
+    work = factors[0].dtype
+    a_norm = np.abs(A).sum(axis=1).max()
+    b_norm = np.abs(b).max(initial=0.0)
+    target = n * np.finfo(float).eps
+
+    def backward_error(x, r):
+        scale = a_norm * np.abs(x).max(initial=0.0) + b_norm
+        return np.abs(r).max(initial=0.0) / scale if scale > 0 else 0.0
+
+    x = lu_solve(factors, b.astype(work)).astype(float)
+    r = b - A @ x
+    err = backward_error(x, r)
+    k = 0
+    while err > target and k < max_iter:
+        x_new = x + lu_solve(factors, r.astype(work)).astype(float)
+        r_new = b - A @ x_new
+        err_new = backward_error(x_new, r_new)
+        k += 1
+        if err_new >= err:  # stagnation: keep the better iterate
+            break
+        x, r, err = x_new, r_new, err_new
+    return RefinementResult(x, k, err, err <= target, condition, precision)
@@ -0,0 +1,185 @@
+# Numerical rank of large matrices without a full SVD of A.
+#   tsqr_rank / TSQR - tall-skinny QR: row blocks are factored independently
+#                      (optionally in worker processes) and their R factors
+#                      merged; A and the n x n R have the same singular values,
+#                      so the rank comes from an SVD (or column-pivoted QR) of
+#                      R. Rows can be appended as they stream in: O(n^2) memory.
+#   estimate_rank    - for a matrix that is only available through products
+#                      A x and A^T y (Lab 5 LinearOperator, scipy LinearOperator,
+#                      sparse matrices): an orthonormal basis Q of the range of
+#                      A is grown block by block from random probes (adaptive
+#                      randomized range finder) until A is captured to
+#                      tolerance, and the rank is read off the singular values
+#                      of the small matrix Q^T A. Memory is O((m + n) r).
+import os
+import sys
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Sparse matrix and operator support lives in Lab 5
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab 5"))
+from linear_operator import aslinearoperator
+
+RankResult = namedtuple("RankResult", ["rank", "singular_values", "tol"])
+
+# Rows per block when tsqr_rank splits an in-memory matrix
+BLOCK_ROWS = 65536
+
+
+# Function to compute the R factor of a block of rows (runs in worker processes too)
+def _r_factor(rows):
+    return np.linalg.qr(np.asarray(rows, dtype=float), mode="r")
+
+
+class TSQR:
+    """
+    R factor of all rows seen so far (A^T A = R^T R, at most n x n).
+    append() folds in a block of k rows at O((n + k) n^2); extend() factors
+    many blocks, in parallel if workers > 1, and merges their R factors.
+    """
+
+    def __init__(self, n):
+        self.n = int(n)
+        self.R = np.zeros((0, self.n))
+        self.rows = 0
+
+    def append(self, rows):
+        rows = np.asarray(rows, dtype=float)
+        rows = rows.reshape(1, -1) if rows.ndim == 1 else rows
+        if rows.ndim != 2 or rows.shape[1] != self.n:
+            raise ValueError(f"Expected rows with {self.n} columns.")
+        self.rows += rows.shape[0]
+        self.R = _r_factor(np.vstack((self.R, rows)))
+        return self
+
+    def extend(self, blocks, workers=None):
+        """Fold in an iterable of row blocks; with workers > 1 at most 2 * workers blocks are in flight."""
+        if workers is None or workers == 1:
+            for block in blocks:
+                self.append(block)
+            return self
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for block in blocks:
+                block = np.asarray(block, dtype=float)
+                if block.ndim != 2 or block.shape[1] != self.n:
+                    raise ValueError(f"Expected rows with {self.n} columns.")
+                self.rows += block.shape[0]
+                pending.append(pool.submit(_r_factor, block))
+                if len(pending) >= 2 * workers:
+                    self._merge(pending.popleft().result())
+            while pending:
+                self._merge(pending.popleft().result())
+        return self
+
+    def _merge(self, R):
+        self.R = _r_factor(np.vstack((self.R, R)))
+
+    def rank(self, tol=None, method="svd"):
+        """
+        method "svd": singular values of R; "qrcp": |r_kk| of a column-pivoted
+        QR of R (cheaper, rank-revealing in practice). The default tol is the
+        np.linalg.matrix_rank threshold max(m, n) * eps * (largest value).
+        """
+        if method == "svd":
+            values = np.linalg.svd(self.R, compute_uv=False) if self.R.size else np.zeros(0)
+        elif method == "qrcp":
+            values = _pivoted_diagonal(self.R)
+        else:
+            raise ValueError("method must be 'svd' or 'qrcp'")
+        top = values[0] if len(values) else 0.0
+        threshold = max(self.rows, self.n) * np.finfo(float).eps * top if tol is None else tol
+        return RankResult(int(np.sum(values > threshold)), values, threshold)
+
+
+# Function to compute |r_kk| of a Householder QR with column pivoting (Businger-Golub)
+def _pivoted_diagonal(R):
+    """Each step moves the remaining column of largest norm to the front; the |r_kk| are non-increasing."""
+    R = np.array(R, dtype=float)
+    m, n = R.shape
+    diag = np.zeros(min(m, n))
+    for k in range(len(diag)):
+        norms = np.linalg.norm(R[k:, k:], axis=0)
+        p = k + int(np.argmax(norms))
+        R[:, [k, p]] = R[:, [p, k]]
+        x = R[k:, k]
+        alpha = norms[p - k]
+        diag[k] = alpha
+        if alpha == 0:
+            break
+        v = x.copy()
+        v[0] += alpha if x[0] >= 0 else -alpha
+        v /= np.linalg.norm(v)
+        R[k:, k:] -= 2.0 * np.outer(v, v @ R[k:, k:])
+    return diag
+
+
+# Function to compute the numerical rank with tall-skinny QR
+def tsqr_rank(A, tol=None, method="svd", block_rows=BLOCK_ROWS, workers=None):
+    """
+    A is an m x n array (split into blocks of block_rows rows; a wide A is
+    transposed first) or an iterable of row blocks, e.g. chunks read from disk.
+    workers > 1 factors the blocks in that many processes. Returns RankResult.
+    """
+    if _is_block_stream(A):
+        blocks = iter(A)
+        first = np.asarray(next(blocks), dtype=float)
+        first = first.reshape(1, -1) if first.ndim == 1 else first
+        tsqr = TSQR(first.shape[1]).append(first)
+    else:
+        A = np.asarray(A, dtype=float)
+        if A.ndim != 2:
+            raise ValueError("A must be a 2-D matrix or an iterable of row blocks.")
+        if A.shape[0] < A.shape[1]:
+            A = A.T  # same rank, and n^2 memory for the smaller side
+        blocks = (A[i:i + block_rows] for i in range(0, A.shape[0], block_rows))
+        tsqr = TSQR(A.shape[1])
+    return tsqr.extend(blocks, workers).rank(tol, method)
+
+
+# Function to tell row blocks (generator, or a list of 2-D arrays) from a matrix (array, list of rows)
+def _is_block_stream(A):
+    if isinstance(A, np.ndarray):
+        return False
+    if isinstance(A, (list, tuple)):
+        return len(A) > 0 and isinstance(A[0], np.ndarray) and A[0].ndim == 2
+    return hasattr(A, "__iter__")
+
+
+# Function to estimate the numerical rank of A from products with A and A^T
+def estimate_rank(A, tol=None, block=10, max_rank=None, seed=0):
+    """
+    Singular values below tol count as zero; the default is the NumPy
+    matrix_rank threshold max(m, n) * eps * sigma_max. Probes are drawn `block`
+    at a time; the range is complete (with probability 1 - 10^-block) once
+    10 sqrt(2/pi) max ||(I - Q Q^T) A w|| over the probes w is below tol.
+    Returns RankResult(rank, singular values of Q^T A, tol used).
+    """
+    A = aslinearoperator(A)
+    m, n = A.shape
+    limit = min(m, n) if max_rank is None else min(max_rank, m, n)
+    rng = np.random.default_rng(seed)
+    factor = 10 * np.sqrt(2 / np.pi)
+    Q = np.zeros((m, 0))
+    s_max = 0.0  # lower bound on sigma_max from the probes seen so far
+    while True:
+        W = rng.standard_normal((n, block))
+        Y = A.matmat(W)
+        s_max = max(s_max, (np.linalg.norm(Y, axis=0) / np.linalg.norm(W, axis=0)).max())
+        Y -= Q @ (Q.T @ Y)
+        threshold = max(m, n) * np.finfo(float).eps * s_max if tol is None else tol
+        if factor * np.linalg.norm(Y, axis=0).max() <= threshold or Q.shape[1] >= limit:
+            break
+        Y -= Q @ (Q.T @ Y)  # second pass keeps Q orthonormal to working precision
+        Qy, Ry = np.linalg.qr(Y)
+        keep = np.abs(np.diag(Ry)) > threshold / factor
+        Q = np.hstack((Q, Qy[:, keep]))[:, :limit]
+        if not np.any(keep):
+            break
+    if Q.shape[1] == 0:
+        return RankResult(0, np.zeros(0), threshold)
+    sigma = np.linalg.svd(A.rmatmat(Q), compute_uv=False)  # singular values of (Q^T A)^T
+    threshold = max(m, n) * np.finfo(float).eps * sigma[0] if tol is None else tol
+    return RankResult(int(np.sum(sigma > threshold)), sigma, threshold)
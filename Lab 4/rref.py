@@ -0,0 +1,160 @@
+# Reduced row echelon form by Gauss-Jordan elimination, in floating point or
+# exactly. The row operations are applied to [A | I] at the same time, so the
+# result also holds E with E A = rref(A): rank, pivot columns, null space and
+# the solutions of A x = b for any b all come from one elimination pass.
+#   float - partial pivoting, one vectorized rank-1 update per pivot;
+#           |pivot| <= tol counts as zero
+#   exact - fraction-free (Bareiss-style) Gauss-Jordan on integers (rational
+#           input is scaled row by row to integers first); every division is
+#           exact and the result is made of Fractions
+from collections import namedtuple
+from fractions import Fraction
+from math import lcm
+
+import numpy as np
+
+RREFResult = namedtuple("RREFResult", ["matrix", "pivots", "rank", "det", "transform", "tol"])
+SolutionSet = namedtuple("SolutionSet", ["particular", "null_space"])
+
+
+# Function to compute the reduced row echelon form of A
+def rref(A, tol=None, exact=False):
+    """
+    Returns RREFResult(matrix, pivots, rank, det, transform, tol): matrix = rref(A),
+    pivots = pivot column indices, det = det(A) for square A (else None),
+    transform = E with E A = rref(A). Float mode: tol defaults to
+    max(m, n) * eps * ||A||_inf (as MATLAB's rref). exact=True: entries may
+    be ints, Fractions, decimal strings or floats (read as written,
+    0.1 -> 1/10); the output is exact (object arrays of Fractions).
+    """
+    if exact:
+        return _rref_exact(A)
+    A = np.asarray(A, dtype=float)
+    if A.ndim != 2:
+        raise ValueError("A must be a 2-D matrix.")
+    m, n = A.shape
+    if tol is None:
+        tol = max(m, n) * np.finfo(float).eps * (np.abs(A).sum(axis=1).max() if A.size else 0.0)
+    M = np.hstack((A, np.eye(m)))
+    pivots = []
+    det = 1.0
+    r = 0
+    for c in range(n):
+        if r == m:
+            break
+        p = r + int(np.argmax(np.abs(M[r:, c])))
+        if abs(M[p, c]) <= tol:
+            M[r:, c] = 0.0
+            continue
+        if p != r:
+            M[[r, p]] = M[[p, r]]
+            det = -det
+        if m == n:
+            with np.errstate(over="ignore", under="ignore"):
+                det *= M[r, c]
+        M[r] /= M[r, c]
+        col = M[:, c].copy()
+        col[r] = 0.0
+        M -= np.outer(col, M[r])  # clears column c in every other row
+        M[:, c] = 0.0
+        M[r, c] = 1.0
+        pivots.append(c)
+        r += 1
+    det = (det if r == n else 0.0) if m == n else None
+    return RREFResult(M[:, :n], pivots, r, det, M[:, n:], tol)
+
+
+# Function to read one entry exactly
+def _fraction(v):
+    if isinstance(v, (float, np.floating)):
+        return Fraction(repr(float(v)))
+    return Fraction(v)
+
+
+def _rref_exact(A):
+    rows = [[_fraction(v) for v in row] for row in np.asarray(A, dtype=object).tolist()]
+    m = len(rows)
+    n = len(rows[0]) if m else 0
+    if any(len(row) != n for row in rows):
+        raise ValueError("A must be a 2-D matrix.")
+    # Scale each row to integers; E is built from [A_int | D], D = diag(scales), so E A = rref(A)
+    scales = [lcm(*(v.denominator for v in row)) if row else 1 for row in rows]
+    M = np.array([[int(v * s) for v in row] + [s if i == j else 0 for j in range(m)]
+                  for i, (row, s) in enumerate(zip(rows, scales))], dtype=object).reshape(m, n + m)
+    pivots = []
+    sign = 1
+    prev = 1
+    r = 0
+    for c in range(n):
+        if r == m:
+            break
+        nonzero = np.flatnonzero(M[r:, c] != 0)
+        if len(nonzero) == 0:
+            continue
+        p = r + int(nonzero[0])
+        if p != r:
+            M[[r, p]] = M[[p, r]]
+            sign = -sign
+        piv = M[r, c]
+        others = np.arange(m) != r
+        # Every other row: (piv * row - a_ic * pivot row) / previous pivot, an exact division
+        M[others] = (piv * M[others] - np.outer(M[others, c], M[r])) // prev
+        prev = piv
+        pivots.append(c)
+        r += 1
+    # All pivot entries now equal the last pivot
+    R = np.array([[Fraction(v, prev) for v in row] for row in M.tolist()], dtype=object).reshape(m, n + m)
+    det = None
+    if m == n:
+        scale = 1
+        for s in scales:
+            scale *= s
+        det = Fraction(sign * prev, scale) if r == n else Fraction(0)
+    return RREFResult(R[:, :n], pivots, r, det, R[:, n:], 0)
+
+
+# Function to compute a basis of the null space {x : A x = 0} from the RREF
+def null_space(A, tol=None, exact=False):
+    """
+    A may be a matrix or an RREFResult (no new elimination). One basis vector
+    per free column f: x_f = 1, x_p = -rref[i, f] for the pivot p of row i.
+    Returns an n x (n - rank) array (Fractions in exact mode).
+    """
+    result = A if isinstance(A, RREFResult) else rref(A, tol, exact)
+    R, pivots = result.matrix, result.pivots
+    n = R.shape[1]
+    free = [j for j in range(n) if j not in set(pivots)]
+    N = np.zeros((n, len(free)), dtype=R.dtype)
+    one = 1
+    if R.dtype == object:
+        N[:] = Fraction(0)
+        one = Fraction(1)
+    N[free, np.arange(len(free))] = one
+    if pivots and free:
+        N[np.ix_(pivots, np.arange(len(free)))] = -R[:len(pivots)][:, free]
+    return N
+
+
+# Function to describe every solution of A x = b: particular solution + null space
+def solution_set(A, b, tol=None, exact=False):
+    """
+    A may be a matrix or an RREFResult; b is one right-hand side. Returns
+    SolutionSet(particular, null_space), or None when A x = b has no solution
+    (a zero row of rref(A) with a nonzero entry of E b).
+    """
+    result = A if isinstance(A, RREFResult) else rref(A, tol, exact)
+    E, r = result.transform, result.rank
+    if E.dtype == object:
+        c = E.dot(np.array([_fraction(v) for v in np.ravel(np.asarray(b, dtype=object))], dtype=object))
+        if any(v != 0 for v in c[r:]):
+            return None
+        x = np.array([Fraction(0)] * result.matrix.shape[1], dtype=object)
+    else:
+        b = np.asarray(b, dtype=float).ravel()
+        c = E @ b
+        bound = max(result.tol, np.finfo(float).eps * len(b) * np.abs(b).max(initial=0.0))
+        if np.any(np.abs(c[r:]) > bound * max(1.0, np.abs(E).max(initial=0.0))):
+            return None
+        x = np.zeros(result.matrix.shape[1])
+    x[result.pivots] = c[:r]
+    return SolutionSet(x, null_space(result))
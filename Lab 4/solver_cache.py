@@ -0,0 +1,78 @@
+# Factor-once, solve-many front end for A x = b.
+# The LU factors of A are kept in a size-bounded LRU cache keyed by a hash of
+# A, so a repeated A costs two O(n^2) triangular solves instead of O(n^3).
+import hashlib
+import os
+import sys
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+# The LU factorization lives in Lab 1
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab 1"))
+from determinant import lu_factor, lu_solve
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "size", "maxsize"])
+
+
+# Function to hash a matrix (shape, dtype and raw bytes)
+def matrix_key(A):
+    A = np.ascontiguousarray(A, dtype=float)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(A.shape).encode())
+    h.update(A.tobytes())
+    return h.hexdigest()
+
+
+class LUCache:
+    """LRU cache of LU factorizations; solve() accepts one or many right-hand sides."""
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._factors = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def factor(self, A):
+        """Return the cached (lu, perm) for A, factoring it on a miss."""
+        key = matrix_key(A)
+        factors = self._factors.get(key)
+        if factors is not None:
+            self.hits += 1
+            self._factors.move_to_end(key)
+            return factors
+        self.misses += 1
+        lu, perm, _ = lu_factor(A)
+        if np.any(np.diag(lu) == 0):
+            raise np.linalg.LinAlgError("Singular matrix")
+        factors = (lu, perm)
+        self._factors[key] = factors
+        if len(self._factors) > self.maxsize:
+            self._factors.popitem(last=False)
+            self.evictions += 1
+        return factors
+
+    def solve(self, A, b):
+        """Solve A x = b; b may be (n,) or (n, k) for k right-hand sides."""
+        A = np.asarray(A, dtype=float)
+        b = np.asarray(b, dtype=float)
+        if b.shape[0] != A.shape[0]:
+            raise ValueError("b must have as many rows as A.")
+        return lu_solve(self.factor(A), b)
+
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, self.evictions, len(self._factors), self.maxsize)
+
+    def clear(self):
+        self._factors.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
+# Module-level cache shared by solve()
+default_cache = LUCache()
+
+
+# Function to solve A x = b through the shared cache
+def solve(A, b):
+    return default_cache.solve(A, b)
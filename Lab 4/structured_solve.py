@@ -0,0 +1,274 @@
+# Structure-detecting front end for A x = b.
+# One scan of A (O(n^2) dense, O(nnz) sparse) finds its lower and upper
+# bandwidths and, when they are equal, whether it is symmetric; the solve
+# then takes the cheapest correct path:
+#   diagonal      - x = b / d                                  O(n)
+#   tridiagonal   - Thomas algorithm (band LU with pivoting
+#                   unless weakly diagonally dominant)         O(n)
+#   triangular    - forward / back substitution                O(n^2), O(nnz) sparse
+#   banded        - band LU with partial pivoting              O(n l (l + u))
+#   symmetric     - Cholesky, LU if it is not positive definite O(n^3 / 3)
+#                   (sparse input: densified up to DENSE_LIMIT, sparse LU above)
+#   general       - LU through the factor cache (solver_cache.py)
+# Every result names the path it took.
+import os
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from solver_cache import default_cache
+
+# The triangular solver lives in Lab 1
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab 1"))
+from determinant import solve_triangular
+
+# Sparse matrix support lives in Lab 5
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab 5"))
+from csr import as_csr, is_sparse, is_symmetric
+
+Structure = namedtuple("Structure", ["kind", "lower", "upper", "symmetric"])
+SolveResult = namedtuple("SolveResult", ["x", "path"])
+
+# A matrix counts as banded when l + u is at most this fraction of n
+BAND_FRACTION = 0.25
+
+# Sparse symmetric matrices up to this size are densified for the Cholesky attempt
+DENSE_LIMIT = 3000
+
+
+# Function to classify A: diagonal, tridiagonal, triangular, banded, symmetric or general
+def detect_structure(A, tol=0.0):
+    """
+    Returns Structure(kind, lower, upper, symmetric): kind is "diagonal",
+    "tridiagonal", "lower triangular", "upper triangular", "banded",
+    "symmetric" or "general"; lower / upper are the bandwidths. Entries with
+    |a_ij| <= tol * max|a| count as zero (and as equal for symmetry).
+    """
+    if is_sparse(A):
+        A = as_csr(A)
+        n = A.shape[0]
+        if A.shape != (n, n):
+            raise ValueError("A must be a square matrix.")
+        eps = tol * np.abs(A.data).max(initial=0.0)
+        keep = np.abs(A.data) > eps
+        rows, cols = A._row_ids()[keep], A.indices[keep]
+        lower = int(np.max(rows - cols, initial=0))
+        upper = int(np.max(cols - rows, initial=0))
+        symmetric = lower == upper and is_symmetric(A)
+    else:
+        A = np.asarray(A, dtype=float)
+        n = A.shape[0]
+        if A.ndim != 2 or A.shape != (n, n):
+            raise ValueError("A must be a square matrix.")
+        eps = tol * (np.abs(A).max() if A.size else 0.0)
+        mask = np.abs(A) > eps
+        # First and last nonzero column of every row (zero rows are skipped)
+        filled = mask.any(axis=1)
+        idx = np.arange(n)
+        first = np.argmax(mask, axis=1)
+        last = n - 1 - np.argmax(mask[:, ::-1], axis=1)
+        lower = int(np.max((idx - first)[filled], initial=0))
+        upper = int(np.max((last - idx)[filled], initial=0))
+        symmetric = lower == upper and bool(np.all(np.abs(A - A.T) <= eps))
+    if lower == 0 and upper == 0:
+        kind = "diagonal"
+    elif lower <= 1 and upper <= 1:
+        kind = "tridiagonal"
+    elif upper == 0:
+        kind = "lower triangular"
+    elif lower == 0:
+        kind = "upper triangular"
+    elif lower + upper <= BAND_FRACTION * n:
+        kind = "banded"
+    elif symmetric:
+        kind = "symmetric"
+    else:
+        kind = "general"
+    return Structure(kind, lower, upper, symmetric)
+
+
+# Function to solve A x = b through the cheapest path for the structure of A
+def structured_solve(A, b, tol=0.0, cache=default_cache):
+    """
+    A may be dense or sparse (Lab 5 CSRMatrix, scipy.sparse); b is (n,) or
+    (n, k). Returns SolveResult(x, path). Raises LinAlgError for a singular A.
+    General dense matrices are solved through cache, so a repeated A is
+    factored once; general sparse ones with scipy's sparse LU when scipy is
+    installed, densified otherwise. There is no sparse Cholesky here: a sparse
+    symmetric A with n <= DENSE_LIMIT is densified for the Cholesky attempt,
+    a larger one goes to the sparse LU like a general one.
+    """
+    structure = detect_structure(A, tol)
+    kind, lower, upper = structure.kind, structure.lower, structure.upper
+    sparse = is_sparse(A)
+    A = as_csr(A) if sparse else np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    if b.shape[0] != A.shape[0]:
+        raise ValueError("b must have as many rows as A.")
+    if kind == "diagonal":
+        d = A.diagonal() if sparse else np.diag(A)
+        _check_pivots(d)
+        return SolveResult(b / (d if b.ndim == 1 else d[:, None]), "diagonal: division")
+    if kind == "tridiagonal":
+        lo, d, up = (_band(A, k) for k in (-1, 0, 1))
+        dominant = np.all(np.abs(d) >= np.abs(np.append(0.0, lo)) + np.abs(np.append(up, 0.0)))
+        if dominant:
+            return SolveResult(thomas(lo, d, up, b), "tridiagonal: Thomas algorithm")
+        return SolveResult(band_solve(band_factor(A, 1, 1), b),
+                           "tridiagonal: band LU (not diagonally dominant)")
+    if kind.endswith("triangular"):
+        is_lower = kind == "lower triangular"
+        _check_pivots(A.diagonal() if sparse else np.diag(A))
+        name = "forward" if is_lower else "back"
+        if sparse:
+            return SolveResult(_csr_triangular(A, b, is_lower), f"{kind}: sparse {name} substitution")
+        return SolveResult(solve_triangular(A, b, lower=is_lower), f"{kind}: {name} substitution")
+    if kind == "banded":
+        return SolveResult(band_solve(band_factor(A, lower, upper), b),
+                           f"banded (lower {lower}, upper {upper}): band LU")
+    if sparse and kind == "symmetric" and A.shape[0] <= DENSE_LIMIT:
+        A, sparse = A.toarray(), False
+    if sparse:
+        try:
+            from scipy.sparse import csr_matrix
+            from scipy.sparse.linalg import splu
+        except ImportError:
+            A = A.toarray()
+        else:
+            M = csr_matrix((A.data, A.indices, A.indptr), shape=A.shape).tocsc()
+            try:
+                return SolveResult(splu(M).solve(b), f"{kind} sparse: sparse LU")
+            except RuntimeError as e:
+                raise np.linalg.LinAlgError(str(e))
+    if kind == "symmetric" and np.all(np.diag(A) > 0):
+        try:
+            L = np.linalg.cholesky(A)
+        except np.linalg.LinAlgError:
+            pass
+        else:
+            return SolveResult(solve_triangular(L.T, solve_triangular(L, b, lower=True)),
+                               "symmetric: Cholesky")
+    x = cache.solve(A, b)
+    if kind == "symmetric":
+        return SolveResult(x, "symmetric: LU (not positive definite)")
+    return SolveResult(x, f"{kind}: LU")
+
+
+# Function to solve a tridiagonal system from its three diagonals (Thomas algorithm)
+def thomas(lower, diag, upper, b):
+    """
+    lower and upper have n - 1 entries, diag and b have n (b may be (n, k)).
+    O(n) time and memory; no pivoting, so meant for diagonally dominant or
+    symmetric positive definite matrices. Raises LinAlgError on a zero pivot.
+    """
+    lower, diag, upper = (np.asarray(v, dtype=float).tolist() for v in (lower, diag, upper))
+    n = len(diag)
+    if len(lower) != n - 1 or len(upper) != n - 1:
+        raise ValueError("lower and upper must have n - 1 entries.")
+    x = np.array(b, dtype=float)
+    if x.ndim == 1:
+        x = x.tolist()  # scalar loops run faster on a list
+    # Forward sweep: eliminate the subdiagonal, c[i] = upper[i] / pivot
+    c = [0.0] * n
+    piv = diag[0]
+    for i in range(n):
+        if i > 0:
+            piv = diag[i] - lower[i - 1] * c[i - 1]
+        if piv == 0:
+            raise np.linalg.LinAlgError("Singular matrix")
+        if i > 0:
+            x[i] -= lower[i - 1] * x[i - 1]
+        x[i] /= piv
+        if i < n - 1:
+            c[i] = upper[i] / piv
+    # Back substitution
+    for i in range(n - 2, -1, -1):
+        x[i] -= c[i] * x[i + 1]
+    return np.asarray(x)
+
+
+# Function to read diagonal k of A (dense or CSR) in O(n) memory
+def _band(A, k):
+    if isinstance(A, np.ndarray):
+        return np.diagonal(A, k).copy()
+    n = A.shape[0]
+    rows = A._row_ids()
+    on = A.indices - rows == k
+    out = np.zeros(n - abs(k))
+    out[np.minimum(rows[on], A.indices[on])] = A.data[on]
+    return out
+
+
+# Function to compute the band LU factorization with partial pivoting (LAPACK gbtrf layout)
+def band_factor(A, lower, upper):
+    """
+    A (dense or CSR) with the given bandwidths is stored by diagonals:
+    ab[lower + upper + i - j, j] = a_ij, with lower extra rows for the fill-in
+    from row swaps. Returns (ab, piv, lower, upper): U (upper bandwidth
+    lower + upper) and the multipliers of L in ab, piv[k] the row swapped
+    with row k. O(n l (l + u)) time, O(n (2 l + u)) memory.
+    """
+    n = A.shape[0]
+    top = lower + upper
+    ab = np.zeros((2 * lower + upper + 1, n))
+    for k in range(-lower, upper + 1):
+        ab[top - k, max(k, 0):n + min(k, 0)] = _band(A, k)
+    piv = np.arange(n)
+    for k in range(n):
+        below = min(lower, n - 1 - k)
+        cols = np.arange(k, min(k + top + 1, n))
+        p = k + int(np.argmax(np.abs(ab[top:top + below + 1, k])))
+        if ab[top + p - k, k] == 0:
+            raise np.linalg.LinAlgError("Singular matrix")
+        if p != k:
+            piv[k] = p
+            rk, rp = top + k - cols, top + p - cols
+            ab[rk, cols], ab[rp, cols] = ab[rp, cols], ab[rk, cols].copy()
+        if below:
+            ab[top + 1:top + below + 1, k] /= ab[top, k]
+            rows = np.arange(k + 1, k + below + 1)
+            rest = cols[1:]
+            if rest.size:
+                # Rank-1 update of the active block, a_ij -= l_ik u_kj
+                ab[top + rows[:, None] - rest[None, :], rest[None, :]] -= (
+                    ab[top + 1:top + below + 1, k][:, None] * ab[top + k - rest, rest][None, :])
+    return ab, piv, lower, upper
+
+
+# Function to solve A x = b from band_factor() output
+def band_solve(factors, b):
+    ab, piv, lower, upper = factors
+    top = lower + upper
+    n = ab.shape[1]
+    x = np.array(b, dtype=float)
+    for k in range(n):
+        if piv[k] != k:
+            x[[k, piv[k]]] = x[[piv[k], k]]
+        below = min(lower, n - 1 - k)
+        if below:
+            x[k + 1:k + below + 1] -= np.multiply.outer(ab[top + 1:top + below + 1, k], x[k])
+    for k in range(n - 1, -1, -1):
+        cols = np.arange(k + 1, min(k + top + 1, n))
+        if cols.size:
+            x[k] -= ab[top + k - cols, cols] @ x[cols]
+        x[k] /= ab[top, k]
+    return x
+
+
+# Function to solve a sparse triangular system row by row in O(nnz)
+def _csr_triangular(A, b, lower):
+    x = np.array(b, dtype=float)
+    n = A.shape[0]
+    order = range(n) if lower else range(n - 1, -1, -1)
+    for i in order:
+        start, end = A.indptr[i], A.indptr[i + 1]
+        cols, vals = A.indices[start:end], A.data[start:end]
+        off = cols != i
+        x[i] = (x[i] - vals[off] @ x[cols[off]]) / vals[~off].sum()
+    return x
+
+
+def _check_pivots(d):
+    if np.any(d == 0):
+        raise np.linalg.LinAlgError("Singular matrix")
@@ -1,22 +1,15 @@
-# Minimal Gauss-Jacobi for 3 equations
-def simple_jacobi(A, b):
-    x = [0, 0, 0]  # Start with (0,0,0)
-    
-    for it in range(15):
-        x_new = [0, 0, 0]
-        
-        # Update each variable
-        for i in range(3):
-            total = 0
-            for j in range(3):
-                if j != i:
-                    total += A[i][j] * x[j]
-            x_new[i] = (b[i] - total) / A[i][i]
-        
-        print(f"Iter {it+1}: {[round(v,3) for v in x_new]}")
-        x = x_new
-    
-    return x
+from iterative import jacobi
+
+
+# Gauss-Jacobi for any n: stops once the relative residual drops below tol
+def simple_jacobi(A, b, tol=1e-6, max_iter=100):
+    def show(it, x):
+        print(f"Iter {it}: {[round(v,3) for v in x.tolist()]}")
+
+    result = jacobi(A, b, tol=tol, max_iter=max_iter, callback=show)
+    if not result.converged:
+        print(f"No convergence after {result.iterations} iterations")
+    return result.x.tolist()
 
 # Test the function
 A = [[4, 1, 1],
@@ -25,4 +18,4 @@ A = [[4, 1, 1],
 b = [7, 8, 9]
 
 result = simple_jacobi(A, b)
-print(f"\nSolution: x = {result}")
\ No newline at end of file
+print(f"\nSolution: x = {result}")
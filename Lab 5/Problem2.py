@@ -1,19 +1,14 @@
-def gauss_seidel(A, b, max_iter):
-    n = len(A)
-    x = [0] * n
-    
-    for it in range(max_iter):
-        x_new = x.copy()
-        for i in range(n):
-            total = 0
-            for j in range(n):
-                if j != i:
-                    total += A[i][j] * x_new[j]
-            x_new[i] = (b[i] - total) / A[i][i]
-        print(f"Iter {it+1}: {[round(v,6) for v in x_new]}")
-        x = x_new
-    
-    return x
+import iterative
+
+
+def gauss_seidel(A, b, max_iter, tol=1e-10):
+    def show(it, x):
+        print(f"Iter {it}: {[round(v,6) for v in x.tolist()]}")
+
+    result = iterative.gauss_seidel(A, b, tol=tol, max_iter=max_iter, callback=show)
+    if result.converged:
+        print(f"Converged after {result.iterations} iterations")
+    return result.x.tolist()
 
 # User input
 n = int(input("Enter number of equations: "))
@@ -27,4 +22,4 @@ b = list(map(float, input("Enter vector b: ").split()))
 max_iter = int(input("Enter max iterations: "))
 
 result = gauss_seidel(A, b, max_iter)
-print(f"Final solution: {[round(v,6) for v in result]}")
\ No newline at end of file
+print(f"Final solution: {[round(v,6) for v in result]}")
@@ -1,77 +1,127 @@
+import numpy as np
 import streamlit as st
 
-def simple_jacobi(A, b, max_iter):
-    n = len(A)
-    x = [0] * n
-    
-    results = []
-    for it in range(max_iter):
-        x_new = [0] * n
-        for i in range(n):
-            total = 0
-            for j in range(n):
-                if j != i:
-                    total += A[i][j] * x[j]
-            x_new[i] = (b[i] - total) / A[i][i]
-        results.append(x_new.copy())
-        x = x_new
-    
-    return results
-
-def gauss_seidel(A, b, max_iter):
-    n = len(A)
-    x = [0] * n
-    
-    results = []
-    for it in range(max_iter):
-        x_new = x.copy()
-        for i in range(n):
-            total = 0
-            for j in range(n):
-                if j != i:
-                    total += A[i][j] * x_new[j]
-            x_new[i] = (b[i] - total) / A[i][i]
-        results.append(x_new.copy())
-        x = x_new
-    
-    return results
+from csr import load_sparse
+from iterative import jacobi, gauss_seidel, sor, jacobi_spectral_radius, optimal_omega
+from krylov import cg, gmres, solve
+from multigrid import Multigrid
+from warm_start import WarmStartCache
 
 st.title("Linear Equation Solver")
 
 method = st.selectbox("Select Method", 
-                     ["Gauss-Jacobi Method", "Gauss-Seidel Method"])
+                     ["Automatic (CG or GMRES)", "Conjugate Gradient (CG)", "GMRES",
+                      "Gauss-Jacobi Method", "Gauss-Seidel Method", "SOR Method",
+                      "Multigrid (structured grid)"])
 
-n = st.number_input("Number of equations", min_value=2, max_value=10, value=3)
+input_mode = st.radio("Input", ["Enter entries", "Upload sparse matrix (Matrix Market / COO)"])
 
-st.subheader("Enter Matrix A (row-wise)")
-A = []
-for i in range(n):
+if input_mode == "Enter entries":
+    n = st.number_input("Number of equations", min_value=2, max_value=10, value=3)
+
+    st.subheader("Enter Matrix A (row-wise)")
+    A = []
+    for i in range(n):
+        cols = st.columns(n)
+        row = []
+        for j in range(n):
+            with cols[j]:
+                row.append(st.number_input(f"A[{i+1},{j+1}]", value=0.0, key=f"A_{i}_{j}"))
+        A.append(row)
+
+    st.subheader("Enter Vector b")
+    b = []
     cols = st.columns(n)
-    row = []
-    for j in range(n):
-        with cols[j]:
-            row.append(st.number_input(f"A[{i+1},{j+1}]", value=0.0, key=f"A_{i}_{j}"))
-    A.append(row)
+    for i in range(n):
+        with cols[i]:
+            b.append(st.number_input(f"b[{i+1}]", value=0.0, key=f"b_{i}"))
+else:
+    st.subheader("Upload Matrix A")
+    upload = st.file_uploader("A as .mtx, or a COO text file with 'row col value' lines (0-based)",
+                              type=["mtx", "txt", "coo", "csv"])
+    b_upload = st.file_uploader("Vector b (one value per line; optional, defaults to all ones)",
+                                type=["txt", "csv"])
+    if upload is None:
+        st.stop()
+    try:
+        A = load_sparse(upload, delimiter="," if upload.name.endswith(".csv") else None)
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+    n = A.shape[0]
+    b = np.loadtxt(b_upload, delimiter=",", ndmin=1) if b_upload is not None else np.ones(n)
+    st.write(f"A: {A.shape[0]} x {A.shape[1]}, {A.nnz} nonzeros")
+
+max_iter = st.number_input("Maximum iterations", min_value=1, max_value=10000, value=100)
+tol = st.number_input("Tolerance (relative residual)", min_value=0.0, value=1e-8, format="%.1e")
+
+if method == "SOR Method":
+    auto_omega = st.checkbox("Estimate relaxation factor omega from the Jacobi spectral radius", value=True)
+    omega = None if auto_omega else st.number_input("omega", min_value=0.01, max_value=1.99, value=1.5)
+    ordering = st.radio("Ordering", ["multicolor", "natural"],
+                        help="multicolor (red-black on grids) updates each color in one vectorized step")
+
+if method in ("Conjugate Gradient (CG)", "GMRES", "Automatic (CG or GMRES)"):
+    precond_options = {"Automatic (CG or GMRES)": ["auto", "none", "jacobi", "ic0", "ilu0"],
+                       "Conjugate Gradient (CG)": ["ic0", "jacobi", "none"],
+                       "GMRES": ["ilu0", "jacobi", "none"]}
+    precond = st.selectbox("Preconditioner", precond_options[method])
+    if method != "Conjugate Gradient (CG)":
+        restart = st.number_input("GMRES restart length m", min_value=1, max_value=500, value=30)
 
-st.subheader("Enter Vector b")
-b = []
-cols = st.columns(n)
-for i in range(n):
-    with cols[i]:
-        b.append(st.number_input(f"b[{i+1}]", value=0.0, key=f"b_{i}"))
+if method == "Multigrid (structured grid)":
+    grid = st.text_input("Grid shape (points per direction, C order), e.g. 64,64", value=str(n))
+    cycle = st.radio("Cycle", ["V", "W"])
+    smoother = st.radio("Smoother", ["gauss_seidel", "jacobi"])
 
-max_iter = st.number_input("Maximum iterations", min_value=1, max_value=100, value=10)
+warm_start = st.checkbox("Warm start from the last converged solution of a similar system", value=True)
+# Kept across reruns: one cache per browser session
+warm_cache = st.session_state.setdefault("warm_start_cache", WarmStartCache())
 
 if st.button("Compute Solution"):
-    if method == "Gauss-Jacobi Method":
-        results = simple_jacobi(A, b, max_iter)
-    else:
-        results = gauss_seidel(A, b, max_iter)
-    
+    x0 = warm_cache.get("Ax=b", A, b) if warm_start else None
+    try:
+        if method == "Automatic (CG or GMRES)":
+            result, chosen = solve(A, b, x0=x0, tol=tol, max_iter=int(max_iter), M=precond, restart=int(restart))
+            st.write(f"Method used: {chosen}")
+        elif method == "Conjugate Gradient (CG)":
+            result = cg(A, b, x0=x0, tol=tol, max_iter=int(max_iter), M=precond)
+        elif method == "GMRES":
+            result = gmres(A, b, x0=x0, tol=tol, restart=int(restart), max_iter=int(max_iter), M=precond)
+        elif method == "Multigrid (structured grid)":
+            shape = tuple(int(v) for v in grid.split(","))
+            mg = Multigrid(A, shape, smoother=smoother)
+            st.write(f"{len(mg.levels)} levels, coarsest grid {mg.levels[-1].shape}")
+            result = mg.solve(b, x0=x0, tol=tol, max_iter=int(max_iter), kind=cycle)
+        elif method == "Gauss-Jacobi Method":
+            result = jacobi(A, b, x0=x0, tol=tol, max_iter=int(max_iter))
+        elif method == "Gauss-Seidel Method":
+            result = gauss_seidel(A, b, x0=x0, tol=tol, max_iter=int(max_iter))
+        else:
+            if omega is None:
+                rho = jacobi_spectral_radius(A)
+                omega = optimal_omega(rho)
+                st.write(f"Jacobi spectral radius ~ {rho:.6f}, omega = {omega:.6f}")
+            result = sor(A, b, x0=x0, omega=omega, ordering=ordering, tol=tol, max_iter=int(max_iter))
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+
+    if result.converged:
+        warm_cache.put("Ax=b", A, b, result.x)
+
     st.subheader("Results")
-    for i, result in enumerate(results):
-        st.write(f"Iteration {i+1}: {[round(val, 6) for val in result]}")
-    
+    if x0 is not None:
+        st.caption("Started from the cached solution of a similar system")
+    if result.converged:
+        st.success(f"Converged in {result.iterations} iterations")
+    else:
+        st.warning(f"Not converged after {result.iterations} iterations")
+    st.write("Relative residual ||b - Ax|| / ||b|| (last iterations)")
+    st.line_chart(result.history)
+
     st.subheader("Final Solution")
-    final_solution = [round(val, 6) for val in results[-1]]
-    st.write(f"x = {final_solution}")
\ No newline at end of file
+    final_solution = [round(val, 6) for val in result.x[:20].tolist()]
+    st.write(f"x = {final_solution}" + (f" ... ({n} entries)" if n > 20 else ""))
+    if n > 20:
+        st.download_button("Download x", "\n".join(map(repr, result.x.tolist())), file_name="x.txt")
@@ -0,0 +1,287 @@
+# Compressed sparse row (CSR) matrix for the iterative solvers.
+# Memory is O(nnz) and a product A @ x costs O(nnz); scipy.sparse matrices
+# are accepted too (converted through their own .tocsr()).
+import io
+
+import numpy as np
+
+
+class CSRMatrix:
+    """Row i holds data[indptr[i]:indptr[i+1]] in columns indices[indptr[i]:indptr[i+1]]."""
+    __slots__ = ("data", "indices", "indptr", "shape", "_rows", "_sweep")
+
+    def __init__(self, data, indices, indptr, shape):
+        self.data = np.asarray(data, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.shape = (int(shape[0]), int(shape[1]))
+        if len(self.indptr) != self.shape[0] + 1 or len(self.data) != len(self.indices):
+            raise ValueError("Inconsistent CSR arrays.")
+        self._rows = None   # row index of every stored entry, built on first product
+        self._sweep = None  # Gauss-Seidel schedule, built on first sweep
+
+    @classmethod
+    def from_coo(cls, rows, cols, vals, shape=None):
+        """Build from (row, col, value) triplets; duplicate entries are summed."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        vals = np.asarray(vals, dtype=float)
+        if shape is None:
+            shape = (int(rows.max()) + 1 if rows.size else 0, int(cols.max()) + 1 if cols.size else 0)
+        m, n = shape
+        if rows.size and (rows.min() < 0 or rows.max() >= m or cols.min() < 0 or cols.max() >= n):
+            raise ValueError("Entry index outside the matrix shape.")
+        order = np.lexsort((cols, rows))
+        rows, cols, vals = rows[order], cols[order], vals[order]
+        # Sum duplicates: keep the first of each run of equal (row, col)
+        if rows.size:
+            first = np.ones(rows.size, dtype=bool)
+            first[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+            starts = np.flatnonzero(first)
+            vals = np.add.reduceat(vals, starts)
+            rows, cols = rows[starts], cols[starts]
+        indptr = np.zeros(m + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=m), out=indptr[1:])
+        return cls(vals, cols, indptr, (m, n))
+
+    @classmethod
+    def from_dense(cls, A):
+        A = np.asarray(A, dtype=float)
+        rows, cols = np.nonzero(A)
+        return cls.from_coo(rows, cols, A[rows, cols], A.shape)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def _row_ids(self):
+        if self._rows is None:
+            self._rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        return self._rows
+
+    def diagonal(self):
+        rows = self._row_ids()
+        on = rows == self.indices
+        d = np.zeros(min(self.shape))
+        np.add.at(d, rows[on], self.data[on])
+        return d
+
+    def matvec(self, x):
+        """y = A @ x in O(nnz)."""
+        x = np.asarray(x, dtype=float)
+        return np.bincount(self._row_ids(), weights=self.data * x[self.indices],
+                           minlength=self.shape[0])
+
+    def rmatvec(self, y):
+        """A^T y in O(nnz), without forming the transpose."""
+        y = np.asarray(y, dtype=float)
+        return np.bincount(self.indices, weights=self.data * y[self._row_ids()], minlength=self.shape[1])
+
+    def matmat(self, B):
+        """C = A @ B for another sparse matrix B (row-by-row expansion, then summed)."""
+        B = as_csr(B)
+        if self.shape[1] != B.shape[0]:
+            raise ValueError("Inner dimensions do not match.")
+        counts = np.diff(B.indptr)[self.indices]  # entries of B row k for each a_ik
+        first = np.cumsum(counts) - counts
+        pos = np.repeat(B.indptr[self.indices] - first, counts) + np.arange(counts.sum())
+        return CSRMatrix.from_coo(np.repeat(self._row_ids(), counts), B.indices[pos],
+                                  np.repeat(self.data, counts) * B.data[pos],
+                                  (self.shape[0], B.shape[1]))
+
+    def __matmul__(self, other):
+        if is_sparse(other):
+            return self.matmat(other)
+        return self.matvec(other)
+
+    def scale(self, alpha):
+        return CSRMatrix(alpha * self.data, self.indices, self.indptr, self.shape)
+
+    def take_rows(self, rows):
+        """CSRMatrix made of the given rows (same number of columns)."""
+        rows = np.asarray(rows, dtype=np.int64)
+        starts, ends = self.indptr[rows], self.indptr[rows + 1]
+        counts = ends - starts
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        pick = np.repeat(starts - indptr[:-1], counts) + np.arange(indptr[-1])
+        return CSRMatrix(self.data[pick], self.indices[pick], indptr, (len(rows), self.shape[1]))
+
+    def transpose(self):
+        return CSRMatrix.from_coo(self.indices, self._row_ids(), self.data, self.shape[::-1])
+
+    def toarray(self):
+        out = np.zeros(self.shape)
+        np.add.at(out, (self._row_ids(), self.indices), self.data)
+        return out
+
+    def _gauss_seidel_schedule(self):
+        """
+        Split A = L + D + U and group the rows into levels: a row only depends
+        on rows of earlier levels through L, so one level is updated at once.
+        """
+        if self._sweep is not None:
+            return self._sweep
+        n = self.shape[0]
+        rows = self._row_ids()
+        cols = self.indices
+        lower = cols < rows
+        upper = cols > rows
+        lptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows[lower], minlength=n), out=lptr[1:])
+        lcols = cols[lower]
+        # Scalar loop over lists: per-row numpy calls would cost more than the work
+        level = [0] * n
+        ptr, deps = lptr.tolist(), lcols.tolist()
+        for i in range(n):
+            s, e = ptr[i], ptr[i + 1]
+            if e > s:
+                level[i] = max(map(level.__getitem__, deps[s:e])) + 1
+        level = np.array(level, dtype=np.int64)
+        order = np.argsort(level, kind="stable")
+        bounds = np.searchsorted(level[order], np.arange(level.max() + 2 if n else 1))
+
+        # Lower-part entries regrouped level by level
+        position = np.empty(n, dtype=np.int64)
+        position[order] = np.arange(n)
+        lrows, lvals = rows[lower], self.data[lower]
+        regroup = np.argsort(position[lrows], kind="stable")
+        lrows, lcols, lvals = lrows[regroup], lcols[regroup], lvals[regroup]
+        lstart = np.searchsorted(position[lrows], bounds)
+        local = position[lrows] - bounds[level[lrows]]
+
+        U = CSRMatrix.from_coo(rows[upper], cols[upper], self.data[upper], self.shape)
+        self._sweep = (U, order, bounds, lcols, lvals, lstart, local)
+        return self._sweep
+
+    def gauss_seidel_sweep(self, x, b, d, omega=1.0):
+        """
+        One forward Gauss-Seidel sweep on x (in place): (D + L) x = b - U x.
+        With omega != 1 every new value is relaxed (SOR).
+        """
+        U, order, bounds, lcols, lvals, lstart, local = self._gauss_seidel_schedule()
+        rhs = b - U.matvec(x)
+        for g in range(len(bounds) - 1):
+            rows = order[bounds[g]:bounds[g + 1]]
+            s, e = lstart[g], lstart[g + 1]
+            if e > s:
+                acc = np.bincount(local[s:e], weights=lvals[s:e] * x[lcols[s:e]],
+                                  minlength=len(rows))
+                new = (rhs[rows] - acc) / d[rows]
+            else:
+                new = rhs[rows] / d[rows]
+            x[rows] = new if omega == 1.0 else x[rows] + omega * (new - x[rows])
+        return x
+
+    def __repr__(self):
+        return f"CSRMatrix(shape={self.shape}, nnz={self.nnz})"
+
+
+# Function to tell sparse input (ours or scipy.sparse) from dense input
+def is_sparse(A):
+    return isinstance(A, CSRMatrix) or hasattr(A, "tocsr")
+
+
+# Function to build the Kronecker product of two sparse matrices
+def kron(A, B):
+    A, B = as_csr(A), as_csr(B)
+    (ma, na), (mb, nb) = A.shape, B.shape
+    a_rows = np.repeat(np.arange(ma), np.diff(A.indptr))
+    b_rows = np.repeat(np.arange(mb), np.diff(B.indptr))
+    rows = (a_rows[:, None] * mb + b_rows[None, :]).ravel()
+    cols = (A.indices[:, None] * nb + B.indices[None, :]).ravel()
+    vals = (A.data[:, None] * B.data[None, :]).ravel()
+    return CSRMatrix.from_coo(rows, cols, vals, (ma * mb, na * nb))
+
+
+# Function to build a sparse identity matrix
+def identity(n):
+    return CSRMatrix(np.ones(n), np.arange(n), np.arange(n + 1), (n, n))
+
+
+# Function to check A == A^T (dense or CSR)
+def is_symmetric(A):
+    if is_sparse(A):
+        A = as_csr(A)
+        T = A.transpose()
+        return (np.array_equal(T.indptr, A.indptr) and np.array_equal(T.indices, A.indices)
+                and np.allclose(T.data, A.data))
+    A = np.asarray(A, dtype=float)
+    return A.shape[0] == A.shape[1] and np.allclose(A, A.T)
+
+
+# Function to convert scipy.sparse / dense input to CSRMatrix
+def as_csr(A):
+    if isinstance(A, CSRMatrix):
+        return A
+    if hasattr(A, "tocsr"):
+        m = A.tocsr()
+        m.sum_duplicates()
+        return CSRMatrix(m.data, m.indices, m.indptr, m.shape)
+    return CSRMatrix.from_dense(A)
+
+
+def _read_text(source):
+    if hasattr(source, "read"):
+        text = source.read()
+    else:
+        with open(source, "rb") as f:
+            text = f.read()
+    return text.decode() if isinstance(text, bytes) else text
+
+
+# Function to load a Matrix Market (.mtx) coordinate file
+def load_matrix_market(source):
+    """
+    Reads 'matrix coordinate real|integer|pattern general|symmetric|skew-symmetric'.
+    source is a path or an open (text or binary) file.
+    """
+    lines = io.StringIO(_read_text(source))
+    header = lines.readline().lower().split()
+    if len(header) < 5 or header[0] != "%%matrixmarket" or header[1] != "matrix":
+        raise ValueError("Not a Matrix Market matrix file.")
+    fmt, field, symmetry = header[2], header[3], header[4]
+    if fmt != "coordinate" or field == "complex":
+        raise ValueError("Only real coordinate Matrix Market files are supported.")
+    line = lines.readline()
+    while line.startswith("%") or not line.strip():
+        line = lines.readline()
+    m, n, nnz = (int(v) for v in line.split())
+    width = 2 if field == "pattern" else 3
+    body = np.array(lines.read().split(), dtype=float)
+    if body.size != nnz * width:
+        raise ValueError(f"Expected {nnz} entries.")
+    body = body.reshape(nnz, width)
+    rows = body[:, 0].astype(np.int64) - 1  # 1-based on disk
+    cols = body[:, 1].astype(np.int64) - 1
+    vals = np.ones(nnz) if field == "pattern" else body[:, 2]
+    if symmetry in ("symmetric", "skew-symmetric", "hermitian"):
+        off = rows != cols
+        sign = -1.0 if symmetry == "skew-symmetric" else 1.0
+        rows, cols, vals = (np.concatenate((rows, cols[off])),
+                            np.concatenate((cols, rows[off])),
+                            np.concatenate((vals, sign * vals[off])))
+    return CSRMatrix.from_coo(rows, cols, vals, (m, n))
+
+
+# Function to load a plain COO text file: one "row col value" triple per line
+def load_coo(source, shape=None, one_based=False, delimiter=None):
+    text = _read_text(source)
+    if delimiter is not None:
+        text = text.replace(delimiter, " ")
+    lines = [ln for ln in text.splitlines() if ln.strip() and not ln.lstrip().startswith(("#", "%"))]
+    body = np.array(" ".join(lines).split(), dtype=float)
+    if body.size % 3:
+        raise ValueError("Every line must hold row, column and value.")
+    body = body.reshape(-1, 3)
+    rows = body[:, 0].astype(np.int64) - one_based
+    cols = body[:, 1].astype(np.int64) - one_based
+    return CSRMatrix.from_coo(rows, cols, body[:, 2], shape)
+
+
+# Function to load either format, picked by the Matrix Market header
+def load_sparse(source, **kwargs):
+    text = _read_text(source)
+    if text.lstrip().lower().startswith("%%matrixmarket"):
+        return load_matrix_market(io.StringIO(text))
+    return load_coo(io.StringIO(text), **kwargs)
@@ -0,0 +1,358 @@
+# Vectorized Jacobi / Gauss-Seidel engine with tolerance-based stopping.
+# Buffers are allocated once per solve and only a bounded history of the
+# convergence measure is kept (not every iterate). A may be dense, a
+# CSRMatrix or a scipy.sparse matrix (sparse sweeps cost O(nnz)); jacobi()
+# also takes a matrix-free LinearOperator that knows its diagonal.
+from collections import deque, namedtuple
+
+import numpy as np
+
+from csr import CSRMatrix, as_csr
+from linear_operator import as_system, is_operator, known_symmetric
+
+# The breadth-first 2-coloring gives up after max(64, BFS_ROUNDS * sqrt(n)) rounds
+BFS_ROUNDS = 4
+
+IterativeResult = namedtuple("IterativeResult", ["x", "iterations", "converged", "history"])
+
+
+# Function to set up A, b, the diagonal and the starting vector
+def _prepare(A, b, x0):
+    A = as_system(A)
+    b = np.asarray(b, dtype=float)
+    n = b.shape[0]
+    if A.shape != (n, n):
+        raise ValueError("A must be n x n and b must have n entries.")
+    try:
+        d = np.array(A.diagonal(), dtype=float)
+    except NotImplementedError:
+        raise ValueError("A matrix-free operator needs diagonal() for Jacobi.") from None
+    if np.any(d == 0):
+        raise ValueError("Zero on the diagonal: Jacobi / Gauss-Seidel need a nonzero diagonal.")
+    x = np.zeros(n) if x0 is None else np.array(x0, dtype=float)
+    return A, b, d, x
+
+
+# Function to reject matrix-free operators where rows of A are needed
+def _need_rows(A, method):
+    if is_operator(A):
+        raise ValueError(f"{method} updates x row by row and needs the entries of A; "
+                         "use jacobi(), cg() or gmres() for a matrix-free operator.")
+
+
+# Function to compute r = b - A x into the buffer r
+def _residual(A, x, b, r):
+    if isinstance(A, np.ndarray):
+        np.dot(A, x, out=r)
+    else:
+        r[:] = A.matvec(x)
+    np.subtract(b, r, out=r)
+    return r
+
+
+# Function to measure convergence: relative residual or relative step
+def _measure(criterion, r, step, x, bnorm):
+    if criterion == "residual":
+        return np.linalg.norm(r) / bnorm
+    return np.linalg.norm(step) / max(np.linalg.norm(x), 1e-300)
+
+
+def _check_criterion(criterion):
+    if criterion not in ("residual", "step"):
+        raise ValueError("criterion must be 'residual' or 'step'")
+
+
+# Function to solve A x = b with the (damped) Jacobi iteration
+def jacobi(A, b, x0=None, tol=1e-8, max_iter=1000, criterion="residual",
+           omega=1.0, history=100, callback=None):
+    """
+    x_{k+1} = x_k + omega * D^-1 (b - A x_k), i.e. D^-1 (b - R x_k) for omega = 1.
+    Stops when ||b - A x|| / ||b|| <= tol (criterion="residual") or when
+    ||x_{k+1} - x_k|| / ||x_{k+1}|| <= tol (criterion="step").
+    history keeps the last `history` values of the stopping measure.
+    callback(k, x) is called after every sweep.
+    """
+    _check_criterion(criterion)
+    A, b, d, x = _prepare(A, b, x0)
+    bnorm = np.linalg.norm(b) or 1.0
+    r = np.empty_like(x)
+    step = np.empty_like(x)
+    hist = deque(maxlen=history)
+    for k in range(max_iter + 1):
+        _residual(A, x, b, r)  # r = b - A x_k
+        if criterion == "residual":
+            hist.append(_measure(criterion, r, None, x, bnorm))
+            if hist[-1] <= tol:
+                return IterativeResult(x, k, True, list(hist))
+        if k == max_iter:
+            break
+        np.divide(r, d, out=step)
+        step *= omega
+        x += step
+        if callback is not None:
+            callback(k + 1, x)
+        if criterion == "step":
+            hist.append(_measure(criterion, r, step, x, bnorm))
+            if hist[-1] <= tol:
+                return IterativeResult(x, k + 1, True, list(hist))
+    return IterativeResult(x, max_iter, False, list(hist))
+
+
+# Function to repeat an in-place sweep until the stopping rule holds
+def _iterate(A, b, x, sweep, tol, max_iter, criterion, history, callback):
+    bnorm = np.linalg.norm(b) or 1.0
+    # Only the buffers of the criterion in use: r for "residual", old and step for "step"
+    residual = criterion == "residual"
+    r = np.empty_like(x) if residual else None
+    old = None if residual else np.empty_like(x)
+    step = None if residual else np.empty_like(x)
+    hist = deque(maxlen=history)
+    for k in range(1, max_iter + 1):
+        if not residual:
+            np.copyto(old, x)
+        sweep(x, b)
+        if callback is not None:
+            callback(k, x)
+        if residual:
+            _residual(A, x, b, r)
+        else:
+            np.subtract(x, old, out=step)
+        hist.append(_measure(criterion, r, step, x, bnorm))
+        if hist[-1] <= tol:
+            return IterativeResult(x, k, True, list(hist))
+    return IterativeResult(x, max_iter, False, list(hist))
+
+
+# Function to build the weighted Jacobi sweep x <- x + omega D^-1 (b - A x) (a smoother)
+def jacobi_sweep(A, d, omega=1.0):
+    scale = omega / d
+
+    def sweep(x, b):
+        x += scale * (b - A @ x)
+    return sweep
+
+
+# Function to build the natural-order (row by row) SOR sweep, omega = 1 is Gauss-Seidel
+def natural_sweep(A, d, omega=1.0):
+    """Returns sweep(x, b), which updates x in place."""
+    if isinstance(A, CSRMatrix):
+        return lambda x, b: A.gauss_seidel_sweep(x, b, d, omega)
+
+    def sweep(x, b):
+        for i in range(len(x)):
+            x[i] += omega * (b[i] - A[i] @ x) / d[i]
+    return sweep
+
+
+# Function to solve A x = b with the Gauss-Seidel iteration
+def gauss_seidel(A, b, x0=None, tol=1e-8, max_iter=1000, criterion="residual",
+                 history=100, callback=None):
+    """
+    Same stopping rules as jacobi(). Each x[i] uses the already updated
+    x[0..i-1]: dense A is swept row by row (one dot product per row), sparse
+    A level by level through CSRMatrix.gauss_seidel_sweep().
+    """
+    _check_criterion(criterion)
+    A, b, d, x = _prepare(A, b, x0)
+    _need_rows(A, "Gauss-Seidel")
+    return _iterate(A, b, x, natural_sweep(A, d), tol, max_iter, criterion, history, callback)
+
+
+# Function to estimate the spectral radius of the Jacobi matrix J = I - D^-1 A
+def jacobi_spectral_radius(A, max_iter=2000, tol=1e-2, seed=0):
+    """
+    Symmetric A with positive diagonal: Lanczos on S = D^-1/2 A D^-1/2, whose
+    eigenvalues are 1 - eig(J); the extreme Ritz values converge in O(sqrt(cond))
+    steps, where power iteration would need O(cond). Otherwise power iteration
+    on J^2 (consistently ordered matrices have a +-rho eigenvalue pair).
+    Stops once the estimate of 1 - rho changes by less than tol (relative).
+    """
+    A = as_system(A)
+    A, _, d, _ = _prepare(A, np.zeros(A.shape[0]), None)
+    n = A.shape[0]
+    v = np.random.default_rng(seed).standard_normal(n)
+    v /= np.linalg.norm(v)
+    rho = 0.0
+    if np.all(d > 0) and known_symmetric(A):
+        s = 1.0 / np.sqrt(d)
+        alpha, beta = [], []
+        prev = np.zeros(n)
+        b = 0.0
+        for k in range(1, min(max_iter, n) + 1):
+            w = s * (A @ (s * v)) - b * prev
+            a = v @ w
+            w -= a * v
+            alpha.append(a)
+            b = np.linalg.norm(w)
+            if k % 10 == 0 or b == 0.0 or k == min(max_iter, n):
+                theta = np.linalg.eigvalsh(np.diag(alpha) + np.diag(beta, 1) + np.diag(beta, -1))
+                new = max(abs(1.0 - theta[0]), abs(1.0 - theta[-1]))
+                if b == 0.0 or abs(new - rho) <= tol * abs(1.0 - new):
+                    return new
+                rho = new
+            beta.append(b)
+            prev, v = v, w / b
+        return rho
+    for _ in range(max_iter):
+        w = v - (A @ v) / d
+        w = w - (A @ w) / d  # two steps: J^2 v
+        growth = np.linalg.norm(w)
+        if growth == 0.0:
+            return 0.0
+        new = np.sqrt(growth)
+        v = w / growth
+        if abs(new - rho) <= tol * abs(1.0 - new):
+            return new
+        rho = new
+    return rho
+
+
+# Function to turn the Jacobi spectral radius into the SOR relaxation factor
+def optimal_omega(rho):
+    """Young's formula 2 / (1 + sqrt(1 - rho^2)); falls back to 1 if rho >= 1."""
+    if rho >= 1.0:
+        return 1.0
+    return 2.0 / (1.0 + np.sqrt(1.0 - rho * rho))
+
+
+# Function to give the points of a regular grid the red-black colors
+def red_black(shape):
+    """Color (i + j + ...) % 2 for a grid numbered in C order (e.g. a 5-point stencil)."""
+    return (np.indices(shape).sum(axis=0) % 2).ravel()
+
+
+# Function to color the rows so that no two coupled rows share a color
+def greedy_coloring(A, seed=0):
+    """
+    Colors the graph of A + A^T in vectorized rounds, each O(nnz) at most:
+    first a breadth-first search, whose level parity is a 2-coloring when the
+    graph is bipartite (grid stencils in any numbering get red-black); if the
+    graph is not bipartite or the search needs more than
+    max(64, BFS_ROUNDS * sqrt(n)) rounds (long chains, many components),
+    Jones-Plassmann: every round, each uncolored row whose random priority
+    beats all its uncolored neighbours takes the smallest color none of its
+    neighbours has.
+    """
+    C = as_csr(A)
+    n = C.shape[0]
+    rows = C._row_ids()
+    off = rows != C.indices
+    src = np.concatenate((rows[off], C.indices[off]))
+    dst = np.concatenate((C.indices[off], rows[off]))
+    G = CSRMatrix.from_coo(src, dst, np.ones(len(src)), (n, n))
+    colors = _bipartite_coloring(G)
+    if colors is None:
+        colors = _jones_plassmann(G, np.random.default_rng(seed).permutation(n))
+    return colors
+
+
+def _neighbours(G, vertices):
+    """All neighbours of `vertices` (with repeats), as one gather over the CSR arrays."""
+    starts, ends = G.indptr[vertices], G.indptr[vertices + 1]
+    counts = ends - starts
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return G.indices[offsets + np.arange(counts.sum())]
+
+
+def _bipartite_coloring(G):
+    n = G.shape[0]
+    level = np.full(n, -1, dtype=np.int64)
+    level[np.diff(G.indptr) == 0] = 0  # isolated rows
+    frontier = np.empty(0, dtype=np.int64)
+    depth = 0
+    for _ in range(max(64, int(BFS_ROUNDS * np.sqrt(n)))):
+        if frontier.size == 0:
+            unseen = np.flatnonzero(level < 0)
+            if unseen.size == 0:
+                break
+            frontier = unseen[:1]  # next connected component
+            depth = 0
+            level[frontier] = 0
+        nxt = _neighbours(G, frontier)
+        nxt = np.unique(nxt[level[nxt] < 0])
+        depth += 1
+        level[nxt] = depth
+        frontier = nxt
+    else:
+        return None
+    colors = level % 2
+    src = np.repeat(np.arange(n), np.diff(G.indptr))
+    if np.any(colors[src] == colors[G.indices]):
+        return None
+    return colors
+
+
+def _jones_plassmann(G, priority):
+    n = G.shape[0]
+    src = np.repeat(np.arange(n), np.diff(G.indptr))
+    dst = G.indices
+    colors = np.full(n, -1, dtype=np.int64)
+    while True:
+        open_rows = colors < 0
+        if not open_rows.any():
+            return colors
+        # Winners: uncolored rows with no uncolored neighbour of higher priority
+        live = open_rows[src] & open_rows[dst]
+        beaten = np.zeros(n, dtype=bool)
+        beaten[src[live & (priority[dst] > priority[src])]] = True
+        winners = open_rows & ~beaten
+        # Smallest color not taken by a (colored) neighbour
+        edge = winners[src] & ~open_rows[dst]
+        w_src, w_col = src[edge], colors[dst[edge]]
+        new = np.full(n, -1, dtype=np.int64)
+        c = 0
+        while True:
+            taken = np.zeros(n, dtype=bool)
+            taken[w_src[w_col == c]] = True
+            pick = winners & ~taken & (new < 0)
+            new[pick] = c
+            if not np.any(winners & (new < 0)):
+                break
+            c += 1
+        colors[winners] = new[winners]
+
+
+# Function to build the multicolor SOR sweep: one vectorized update per color
+def multicolor_sweep(A, d, omega, colors):
+    """Returns sweep(x, b); colors are visited in increasing order."""
+    colors = np.asarray(colors)
+    if colors.shape != (len(d),):
+        raise ValueError("colors must hold one color per row.")
+    groups = []
+    for c in np.unique(colors):
+        rows = np.flatnonzero(colors == c)
+        block = A.take_rows(rows) if isinstance(A, CSRMatrix) else A[rows]
+        groups.append((rows, block, omega / d[rows]))
+
+    def sweep(x, b):
+        for rows, block, scale in groups:
+            x[rows] += scale * (b[rows] - block @ x)
+    return sweep
+
+
+# Function to solve A x = b with successive over-relaxation
+def sor(A, b, x0=None, omega=None, ordering="multicolor", colors=None, tol=1e-8,
+        max_iter=1000, criterion="residual", history=100, callback=None):
+    """
+    x_i <- x_i + omega * (b_i - A_i x) / a_ii, sweeping in `ordering`:
+      "natural"    - row by row, as gauss_seidel()
+      "multicolor" - rows grouped by color (red-black for grid stencils); rows
+                     of one color are not coupled, so a color is one NumPy update.
+    omega=None estimates it from the Jacobi spectral radius (optimal_omega).
+    colors defaults to greedy_coloring(A) (red-black for grid stencils); pass
+    red_black(grid_shape) for a grid to skip the coloring.
+    """
+    _check_criterion(criterion)
+    A, b, d, x = _prepare(A, b, x0)
+    _need_rows(A, "SOR")
+    if omega is None:
+        omega = optimal_omega(jacobi_spectral_radius(A))
+    if not 0.0 < omega < 2.0:
+        raise ValueError("SOR needs 0 < omega < 2.")
+    if ordering == "natural":
+        sweep = natural_sweep(A, d, omega)
+    elif ordering == "multicolor":
+        sweep = multicolor_sweep(A, d, omega, greedy_coloring(A) if colors is None else colors)
+    else:
+        raise ValueError("ordering must be 'natural' or 'multicolor'")
+    return _iterate(A, b, x, sweep, tol, max_iter, criterion, history, callback)
@@ -0,0 +1,366 @@
+# Krylov solvers for A x = b: preconditioned CG (symmetric positive definite A)
+# and restarted GMRES(m) (any nonsingular A), with Jacobi, IC(0) and ILU(0)
+# preconditioners. A may be dense, a CSRMatrix, a scipy.sparse matrix or a
+# matrix-free LinearOperator (then only Jacobi preconditioning, if it knows
+# its diagonal).
+from collections import deque
+
+import numpy as np
+
+from csr import CSRMatrix, as_csr, is_sparse, is_symmetric
+from linear_operator import as_system, is_operator, known_symmetric
+from iterative import IterativeResult
+
+# ILU(0) is vectorized over levels when they hold at least this many rows on average
+LEVEL_WIDTH = 32
+
+
+# Function to set up A, b and the starting vector (no diagonal requirement)
+def _prepare(A, b, x0):
+    A = as_system(A)
+    b = np.asarray(b, dtype=float)
+    n = b.shape[0]
+    if A.shape != (n, n):
+        raise ValueError("A must be n x n and b must have n entries.")
+    x = np.zeros(n) if x0 is None else np.array(x0, dtype=float)
+    return A, b, x
+
+
+# Triangular solve with a CSR factor, one vectorized step per level
+class _Triangular:
+    __slots__ = ("T", "d", "lower")
+
+    def __init__(self, T, lower):
+        # An upper factor is solved as a lower one with rows and columns reversed
+        if not lower:
+            n = T.shape[0]
+            rows = np.repeat(np.arange(n), np.diff(T.indptr))
+            T = CSRMatrix.from_coo(n - 1 - rows, n - 1 - T.indices, T.data, T.shape)
+        self.T = T
+        self.d = T.diagonal()
+        self.lower = lower
+
+    def solve(self, rhs):
+        y = np.zeros(len(rhs))
+        if self.lower:
+            return self.T.gauss_seidel_sweep(y, rhs, self.d)
+        return self.T.gauss_seidel_sweep(y, rhs[::-1].copy(), self.d)[::-1]
+
+
+class JacobiPreconditioner:
+    """M = diag(A); M^-1 r = r / diag(A)."""
+
+    def __init__(self, A):
+        try:
+            d = np.asarray(as_system(A).diagonal(), dtype=float)
+        except NotImplementedError:
+            raise ValueError("The operator does not know its diagonal: Jacobi preconditioner undefined.") from None
+        if np.any(d == 0):
+            raise ValueError("Zero on the diagonal: Jacobi preconditioner undefined.")
+        self.inv_diag = 1.0 / d
+
+    def __call__(self, r):
+        return self.inv_diag * r
+
+
+class ILU0:
+    """
+    Incomplete LU with the sparsity pattern of A (no fill-in): A ~ L U with L
+    unit lower and U upper triangular; M^-1 r is two triangular solves. The
+    factorization is vectorized over the Gauss-Seidel levels of A when they
+    hold LEVEL_WIDTH rows on average, a scalar row loop otherwise (chains).
+    """
+
+    def __init__(self, A, shift=0.0):
+        if is_operator(A):
+            raise ValueError("ILU(0) needs the entries of A, not a matrix-free operator.")
+        A = as_csr(A)
+        n = A.shape[0]
+        indptr, indices = A.indptr, A.indices
+        data = A.data.copy()
+        rows = A._row_ids()
+        diag = np.flatnonzero(rows == indices)
+        if len(diag) != n:
+            raise ValueError("ILU(0) needs every diagonal entry in the sparsity pattern.")
+        data[diag] += shift * np.abs(data[diag])
+        _, order, bounds = A._gauss_seidel_schedule()[:3]
+        if n >= LEVEL_WIDTH * (len(bounds) - 1):
+            _eliminate_levels(indptr, indices, data, diag, order, bounds)
+        else:
+            data[:] = _eliminate_rows(indptr, indices, data, diag)
+        self.pivots = data[diag]
+        lower = indices < rows
+        unit = np.ones(n)
+        self.L = _Triangular(CSRMatrix.from_coo(np.concatenate((rows[lower], np.arange(n))),
+                                                np.concatenate((indices[lower], np.arange(n))),
+                                                np.concatenate((data[lower], unit)), A.shape), True)
+        upper = indices >= rows
+        self.U = _Triangular(CSRMatrix.from_coo(rows[upper], indices[upper], data[upper], A.shape), False)
+
+    def __call__(self, r):
+        return self.U.solve(self.L.solve(r))
+
+
+# Function to run ILU(0) (IKJ order) in place, one level of independent rows at a time
+def _eliminate_levels(indptr, indices, data, diag, order, bounds):
+    """
+    Row i only needs the finished U rows of the k < i in its pattern, so the
+    rows of one level are eliminated together: step t applies the t-th lower
+    entry of every row of the level.
+    """
+    n = len(diag)
+    key = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr)) * n + indices  # sorted
+    nlower = diag - indptr[:-1]
+    for g in range(len(bounds) - 1):
+        level = order[bounds[g]:bounds[g + 1]]
+        for t in range(int(nlower[level].max(initial=0))):
+            i = level[nlower[level] > t]
+            p = indptr[i] + t
+            k = indices[p]
+            piv = data[diag[k]]
+            if np.any(piv == 0):
+                raise ValueError(f"Zero pivot in ILU(0) at row {k[piv == 0][0]}.")
+            data[p] /= piv
+            # a_ij -= l_ik u_kj for the j > k that are in the pattern of row i
+            starts = diag[k] + 1
+            counts = indptr[k + 1] - starts
+            q = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            want = np.repeat(i, counts) * n + indices[q]
+            loc = np.minimum(np.searchsorted(key, want), len(key) - 1)
+            hit = key[loc] == want
+            data[loc[hit]] -= np.repeat(data[p], counts)[hit] * data[q[hit]]
+
+
+# Function to run ILU(0) (IKJ order) row by row on lists; returns the factored entries
+def _eliminate_rows(indptr, indices, data, diag):
+    ptr, cols, vals, dg = indptr.tolist(), indices.tolist(), data.tolist(), diag.tolist()
+    for i in range(len(dg)):
+        s, e = ptr[i], ptr[i + 1]
+        where = dict(zip(cols[s:e], range(s, e)))
+        for p in range(s, dg[i]):  # entries (i, k) with k < i, left to right
+            k = cols[p]
+            if vals[dg[k]] == 0:
+                raise ValueError(f"Zero pivot in ILU(0) at row {k}.")
+            vals[p] /= vals[dg[k]]
+            # a_ij -= l_ik u_kj for the j > k that are in the pattern of row i
+            for q in range(dg[k] + 1, ptr[k + 1]):
+                r = where.get(cols[q])
+                if r is not None:
+                    vals[r] -= vals[p] * vals[q]
+    return vals
+
+
+class IC0(ILU0):
+    """
+    Incomplete Cholesky IC(0) for symmetric positive definite A. For symmetric A
+    the no-fill factors satisfy U = D L^T, so A ~ L D L^T; the pivots D must be
+    positive for M to be SPD (as CG needs), otherwise the diagonal is shifted by
+    shift * |a_ii| and the factorization retried.
+    """
+
+    def __init__(self, A, max_shifts=10):
+        if is_operator(A):
+            raise ValueError("IC(0) needs the entries of A, not a matrix-free operator.")
+        A = as_csr(A)
+        if not is_symmetric(A):
+            raise ValueError("IC(0) needs a symmetric matrix.")
+        shift = 0.0
+        for _ in range(max_shifts + 1):
+            try:
+                super().__init__(A, shift)
+                if np.all(self.pivots > 0):
+                    self.shift = shift
+                    return
+            except ValueError:
+                pass
+            shift = 1e-3 if shift == 0.0 else 2 * shift
+        raise ValueError("IC(0) broke down: A does not look positive definite.")
+
+
+PRECONDITIONERS = {"none": None, "jacobi": JacobiPreconditioner, "ic0": IC0, "ilu0": ILU0}
+
+
+# Function to build a preconditioner by name ("none", "jacobi", "ic0", "ilu0")
+def make_preconditioner(A, kind):
+    if callable(kind) or kind is None:
+        return kind
+    if kind not in PRECONDITIONERS:
+        raise ValueError(f"Unknown preconditioner {kind!r}; use one of {list(PRECONDITIONERS)}")
+    factory = PRECONDITIONERS[kind]
+    return None if factory is None else factory(A)
+
+
+# Function to solve SPD A x = b with the preconditioned conjugate gradient method
+def cg(A, b, x0=None, tol=1e-8, max_iter=1000, M=None, history=100, callback=None):
+    """
+    M is a preconditioner name (see make_preconditioner) or a callable r -> M^-1 r.
+    Stops when ||b - A x|| / ||b|| <= tol; raises ValueError if A turns out
+    not to be positive definite (p^T A p <= 0).
+    """
+    A, b, x = _prepare(A, b, x0)
+    M = make_preconditioner(A, M)
+    bnorm = np.linalg.norm(b) or 1.0
+    r = b - A @ x
+    z = r if M is None else M(r)
+    p = z.copy()
+    rz = r @ z
+    hist = deque([np.linalg.norm(r) / bnorm], maxlen=history)
+    if hist[-1] <= tol:
+        return IterativeResult(x, 0, True, list(hist))
+    for k in range(1, max_iter + 1):
+        Ap = A @ p
+        curvature = p @ Ap
+        if curvature <= 0:
+            raise ValueError("CG breakdown: A is not positive definite.")
+        alpha = rz / curvature
+        x += alpha * p
+        r -= alpha * Ap
+        if callback is not None:
+            callback(k, x)
+        hist.append(np.linalg.norm(r) / bnorm)
+        if hist[-1] <= tol:
+            return IterativeResult(x, k, True, list(hist))
+        z = r if M is None else M(r)
+        rz_new = r @ z
+        p *= rz_new / rz
+        p += z
+        rz = rz_new
+    return IterativeResult(x, max_iter, False, list(hist))
+
+
+# Function to solve A x = b with restarted, right-preconditioned GMRES(m)
+def gmres(A, b, x0=None, tol=1e-8, restart=30, max_iter=1000, M=None, history=100, callback=None):
+    """
+    Builds an orthonormal Krylov basis of A M^-1 (classical Gram-Schmidt done
+    twice, so each step is two matrix-vector products with the basis) and
+    minimizes the residual with Givens rotations. iterations counts inner
+    steps; callback(k, x) is called after each restart cycle.
+    """
+    A, b, x = _prepare(A, b, x0)
+    M = make_preconditioner(A, M)
+    n = len(b)
+    m = max(1, min(restart, n))
+    bnorm = np.linalg.norm(b) or 1.0
+    V = np.empty((m + 1, n))
+    H = np.zeros((m + 1, m))
+    cs = np.empty(m)
+    sn = np.empty(m)
+    g = np.empty(m + 1)
+    hist = deque(maxlen=history)
+    total = 0
+    while True:
+        r = b - A @ x
+        beta = np.linalg.norm(r)
+        hist.append(beta / bnorm)
+        if hist[-1] <= tol:
+            return IterativeResult(x, total, True, list(hist))
+        if total >= max_iter:
+            return IterativeResult(x, total, False, list(hist))
+        V[0] = r / beta
+        H[:] = 0.0
+        g[:] = 0.0
+        g[0] = beta
+        j = 0
+        while j < m and total < max_iter:
+            w = A @ (V[j] if M is None else M(V[j]))
+            h = V[:j + 1] @ w
+            w -= h @ V[:j + 1]
+            h2 = V[:j + 1] @ w
+            w -= h2 @ V[:j + 1]
+            H[:j + 1, j] = h + h2
+            H[j + 1, j] = np.linalg.norm(w)
+            # Apply the earlier rotations, then one that zeroes H[j+1, j]
+            for i in range(j):
+                H[i, j], H[i + 1, j] = (cs[i] * H[i, j] + sn[i] * H[i + 1, j],
+                                        -sn[i] * H[i, j] + cs[i] * H[i + 1, j])
+            rho = np.hypot(H[j, j], H[j + 1, j])
+            cs[j], sn[j] = (H[j, j] / rho, H[j + 1, j] / rho) if rho else (1.0, 0.0)
+            breakdown = H[j + 1, j] == 0.0
+            if not breakdown:
+                V[j + 1] = w / H[j + 1, j]
+            H[j, j], H[j + 1, j] = rho, 0.0
+            g[j], g[j + 1] = cs[j] * g[j], -sn[j] * g[j]
+            j += 1
+            total += 1
+            if abs(g[j]) / bnorm <= tol or breakdown:
+                break
+        y = np.linalg.solve(np.triu(H[:j, :j]), g[:j]) if j else np.zeros(0)
+        update = y @ V[:j]
+        x += update if M is None else M(update)
+        if callback is not None:
+            callback(total, x)
+
+
+# Function to check (cheaply) whether A is symmetric positive definite
+def is_spd(A):
+    """
+    True / False when the answer is certain, None when it is not known:
+    symmetric with a positive diagonal and either a successful dense Cholesky
+    (n <= 2000) or strict diagonal dominance (Gershgorin) counts as SPD.
+    A matrix-free operator is None if it is flagged symmetric, else False.
+    """
+    if is_operator(A):
+        return None if known_symmetric(A) else False
+    if not is_symmetric(A):
+        return False
+    A = as_csr(A) if is_sparse(A) else np.asarray(A, dtype=float)
+    d = A.diagonal()
+    if np.any(d <= 0):
+        return False
+    if isinstance(A, CSRMatrix):
+        off = np.bincount(np.repeat(np.arange(A.shape[0]), np.diff(A.indptr)),
+                          weights=np.abs(A.data), minlength=A.shape[0]) - np.abs(d)
+        return True if np.all(d > off) else None
+    if A.shape[0] > 2000:
+        return True if np.all(2 * d > np.abs(A).sum(axis=1)) else None
+    try:
+        np.linalg.cholesky(A)
+        return True
+    except np.linalg.LinAlgError:
+        return False
+
+
+# Function to pick CG or GMRES (and a preconditioner) from the structure of A
+def solve(A, b, x0=None, tol=1e-8, max_iter=1000, M="auto", restart=30, history=100, callback=None):
+    """
+    SPD (or likely SPD) A -> CG with IC(0), falling back to Jacobi if IC(0) breaks
+    down; anything else, or a CG breakdown -> GMRES(restart) with ILU(0).
+    Returns (result, method) where method names the solver and preconditioner.
+    """
+    spd = is_spd(A)
+    if spd is not False:
+        if M != "auto":
+            precond = M
+        else:
+            try:
+                precond = IC0(A)
+            except ValueError:
+                precond = _jacobi_or_none(A)
+        try:
+            result = cg(A, b, x0, tol, max_iter, precond, history, callback)
+            return result, f"CG + {_name(M, precond)}"
+        except ValueError:
+            pass  # not positive definite after all
+    if M != "auto":
+        precond = M
+    else:
+        try:
+            precond = ILU0(A)
+        except ValueError:
+            precond = _jacobi_or_none(A) if is_operator(A) else None
+    result = gmres(A, b, x0, tol, restart, max_iter, precond, history, callback)
+    return result, f"GMRES({restart}) + {_name(M, precond)}"
+
+
+def _jacobi_or_none(A):
+    try:
+        return JacobiPreconditioner(A)
+    except ValueError:
+        return None
+
+
+def _name(requested, precond):
+    if isinstance(requested, str) and requested != "auto":
+        return requested
+    return {None: "none", JacobiPreconditioner: "jacobi", IC0: "ic0", ILU0: "ilu0"}.get(
+        type(precond) if precond is not None else None, "custom")
@@ -0,0 +1,111 @@
+# Matrix-free linear operators.
+# Anything with `shape` and `matvec` (and, where needed, `rmatvec` for A^T x
+# and `dtype`) can be used where only products with A are needed: the Krylov
+# solvers, Jacobi (if the operator also knows its diagonal), the power method
+# and rank estimation. Only a few vectors of length n are stored, never A.
+import numpy as np
+
+from csr import as_csr, is_sparse, is_symmetric
+
+
+class LinearOperator:
+    """
+    A from its action: matvec(x) = A x, rmatvec(y) = A^T y (optional).
+    diagonal (optional) is an array or a callable returning diag(A); symmetric
+    is a hint for solvers that can exploit it (CG, Lanczos).
+    """
+
+    def __init__(self, shape, matvec, rmatvec=None, dtype=float, diagonal=None, symmetric=False):
+        self.shape = (int(shape[0]), int(shape[1]))
+        self._matvec = matvec
+        self._rmatvec = rmatvec
+        self.dtype = np.dtype(dtype)
+        self._diagonal = diagonal
+        self.symmetric = symmetric
+
+    def matvec(self, x):
+        x = np.asarray(x)
+        if x.shape != (self.shape[1],):
+            raise ValueError(f"Expected a vector of length {self.shape[1]}.")
+        return np.asarray(self._matvec(x))
+
+    def rmatvec(self, y):
+        if self._rmatvec is None:
+            if self.symmetric:
+                return self.matvec(y)
+            raise NotImplementedError("This operator has no rmatvec (A^T y).")
+        y = np.asarray(y)
+        if y.shape != (self.shape[0],):
+            raise ValueError(f"Expected a vector of length {self.shape[0]}.")
+        return np.asarray(self._rmatvec(y))
+
+    def matmat(self, X):
+        """A X, one column at a time."""
+        return np.column_stack([self.matvec(X[:, j]) for j in range(X.shape[1])])
+
+    def rmatmat(self, Y):
+        return np.column_stack([self.rmatvec(Y[:, j]) for j in range(Y.shape[1])])
+
+    def __matmul__(self, x):
+        x = np.asarray(x)
+        return self.matvec(x) if x.ndim == 1 else self.matmat(x)
+
+    def diagonal(self):
+        if self._diagonal is None:
+            raise NotImplementedError("This operator does not know its diagonal.")
+        return np.asarray(self._diagonal() if callable(self._diagonal) else self._diagonal, dtype=float)
+
+    @property
+    def T(self):
+        return LinearOperator(self.shape[::-1], self.rmatvec, self.matvec, self.dtype,
+                              self._diagonal, self.symmetric)
+
+    def __repr__(self):
+        return f"LinearOperator(shape={self.shape}, dtype={self.dtype})"
+
+
+# Function to tell matrix-free operators from arrays and sparse matrices
+def is_operator(A):
+    if isinstance(A, LinearOperator):
+        return True
+    return (hasattr(A, "matvec") and hasattr(A, "shape")
+            and not is_sparse(A) and not isinstance(A, np.ndarray))
+
+
+# Function to wrap an array, sparse matrix or duck-typed operator as a LinearOperator
+def aslinearoperator(A):
+    """
+    Works for LinearOperator, scipy.sparse.linalg.LinearOperator (or anything with
+    shape/matvec/rmatvec), CSRMatrix / scipy.sparse matrices, and dense arrays.
+    """
+    if isinstance(A, LinearOperator):
+        return A
+    if is_operator(A):
+        rmatvec = getattr(A, "rmatvec", None)
+        diagonal = getattr(A, "diagonal", None)
+        return LinearOperator(A.shape, A.matvec, rmatvec, getattr(A, "dtype", float),
+                              diagonal if callable(diagonal) else None,
+                              getattr(A, "symmetric", False))
+    if is_sparse(A):
+        C = as_csr(A)
+        return LinearOperator(C.shape, C.matvec, C.rmatvec, float, C.diagonal)
+    A = np.asarray(A, dtype=float)
+    if A.ndim != 2:
+        raise ValueError("Expected a 2-D matrix or an operator.")
+    return LinearOperator(A.shape, A.__matmul__, A.T.__matmul__, A.dtype, A.diagonal)
+
+
+# Function to accept a system matrix in any supported form: operator, sparse or dense
+def as_system(A):
+    if is_operator(A):
+        return aslinearoperator(A)
+    if is_sparse(A):
+        return as_csr(A)
+    return np.asarray(A, dtype=float)
+
+
+# Function to tell whether A is known to be symmetric (operators: their `symmetric` hint)
+def known_symmetric(A):
+    if is_operator(A):
+        return bool(getattr(A, "symmetric", False))
+    return is_symmetric(A)
@@ -0,0 +1,204 @@
+# Geometric multigrid for Poisson-type systems on 1D, 2D and 3D structured grids.
+# Every level: a few smoothing sweeps (weighted Jacobi or multicolor
+# Gauss-Seidel from iterative.py) damp the oscillatory error, the residual is
+# restricted (full weighting) to a grid with half the points per direction
+# (directions with fewer than 3 points are kept as they are: semi-coarsening),
+# the coarse correction is interpolated back (linear prolongation, weighted
+# by the true point positions, so even grid sizes coarsen as well as odd) and
+# smoothed again. The coarsest grid is solved directly with the Lab 1 LU.
+# One cycle costs O(n), and the number of cycles does not grow with n.
+import os
+import sys
+from collections import deque, namedtuple
+
+import numpy as np
+
+from csr import CSRMatrix, as_csr, identity, kron
+from iterative import IterativeResult, jacobi_sweep, multicolor_sweep
+
+# The dense LU for the coarsest grid lives in Lab 1
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab 1"))
+from determinant import lu_factor, lu_solve
+
+Level = namedtuple("Level", ["A", "shape", "pre", "post", "P", "R"])
+
+
+# Function to build the 1D second-difference matrix (Dirichlet boundary), scaled by 1/h^2
+def _laplacian_1d(N, h):
+    main = np.full(N, 2.0 / h**2)
+    off = np.full(N - 1, -1.0 / h**2)
+    i = np.arange(N)
+    return CSRMatrix.from_coo(np.concatenate((i, i[:-1], i[1:])), np.concatenate((i, i[1:], i[:-1])),
+                              np.concatenate((main, off, off)), (N, N))
+
+
+# Function to build the finite-difference Laplacian -div grad on a grid of interior points
+def poisson_matrix(shape, h=None):
+    """
+    shape = (N,), (N1, N2) or (N1, N2, N3) interior points, numbered in C order;
+    3/5/7-point stencil on the unit interval/square/cube (h = 1/(N+1) per axis).
+    """
+    shape = tuple(int(N) for N in shape)
+    hs = [1.0 / (N + 1) for N in shape] if h is None else [h] * len(shape)
+    A = None
+    for axis, N in enumerate(shape):
+        # I x ... x T_axis x ... x I
+        term = _laplacian_1d(N, hs[axis])
+        before = int(np.prod(shape[:axis]))
+        after = int(np.prod(shape[axis + 1:]))
+        term = kron(kron(identity(before), term), identity(after))
+        A = term if A is None else _add(A, term)
+    return A
+
+
+def _add(A, B):
+    rows_a = np.repeat(np.arange(A.shape[0]), np.diff(A.indptr))
+    rows_b = np.repeat(np.arange(B.shape[0]), np.diff(B.indptr))
+    return CSRMatrix.from_coo(np.concatenate((rows_a, rows_b)), np.concatenate((A.indices, B.indices)),
+                              np.concatenate((A.data, B.data)), A.shape)
+
+
+# Function to build 1D linear interpolation from N // 2 coarse points to N fine points
+def _prolongation_1d(N, x=None):
+    """
+    Coarse point j sits on fine point 2j+1; the others are interpolated
+    linearly from their neighbours (or the Dirichlet boundary). x holds the
+    positions of the boundary, the N fine points and the other boundary
+    (default -1, 0, ..., N: a uniform grid, weights 1/2). For even N the last
+    coarse point is next to the boundary, so the coarse grid is not uniform;
+    the returned coarse positions carry that down to the coarser levels.
+    """
+    x = np.arange(-1.0, N + 1) if x is None else np.asarray(x, dtype=float)
+    Nc = N // 2
+    j = np.arange(Nc)
+    xc = np.concatenate(([x[0]], x[2 * j + 2], [x[-1]]))  # x[i + 1] is fine point i
+    # Even fine points 2k lie between coarse k - 1 and coarse k (xc[k] and xc[k + 1])
+    even = np.arange(0, N, 2)
+    k = even // 2
+    w_right = (x[even + 1] - xc[k]) / (xc[k + 1] - xc[k])
+    rows = np.concatenate((2 * j + 1, even, even))
+    cols = np.concatenate((j, k - 1, k))
+    vals = np.concatenate((np.ones(Nc), 1.0 - w_right, w_right))
+    keep = (cols >= 0) & (cols < Nc)
+    return CSRMatrix.from_coo(rows[keep], cols[keep], vals[keep], (N, Nc)), xc
+
+
+# Function to build prolongation P and full-weighting restriction R = P^T / 2^d
+def transfer_operators(shape, coords=None):
+    """
+    coords: point positions per axis, boundaries included (default uniform).
+    Only the d axes with N >= 3 are coarsened; the others keep their points
+    (P is the identity along them). Returns P, R and the coarse positions per axis.
+    """
+    P = None
+    coarse = []
+    for axis, N in enumerate(shape):
+        x = None if coords is None else coords[axis]
+        if N >= 3:
+            P1, xc = _prolongation_1d(N, x)
+        else:
+            P1, xc = identity(N), np.arange(-1.0, N + 1) if x is None else x
+        coarse.append(xc)
+        P = P1 if P is None else kron(P, P1)
+    return P, P.transpose().scale(0.5 ** _coarsened(shape)), coarse
+
+
+def _coarsened(shape):
+    return sum(N >= 3 for N in shape)
+
+
+# Function to give the grid shape one level down
+def _coarse_shape(shape):
+    return tuple(N // 2 if N >= 3 else N for N in shape)
+
+
+# Function to color a grid so that 9/27-point couplings never join two rows of one color
+def _parity_colors(shape):
+    idx = np.indices(shape)
+    return sum((idx[k] % 2) << k for k in range(len(shape))).ravel()
+
+
+class Multigrid:
+    """
+    Hierarchy for A on a structured grid of `shape` (C order). Coarse operators
+    are Galerkin products R A P, so any Poisson-type (variable-coefficient)
+    stencil works. smoother is "jacobi" (weighted, omega=2/3) or "gauss_seidel"
+    (multicolor; colors visited in reverse order after the correction so the
+    cycle stays symmetric).
+    """
+
+    def __init__(self, A, shape, smoother="gauss_seidel", nu1=2, nu2=2, coarse_size=256, omega=None):
+        shape = tuple(int(N) for N in shape)
+        A = as_csr(A)
+        if A.shape != (int(np.prod(shape)),) * 2:
+            raise ValueError("A must have one row per grid point.")
+        if smoother not in ("jacobi", "gauss_seidel"):
+            raise ValueError("smoother must be 'jacobi' or 'gauss_seidel'")
+        self.nu1, self.nu2 = nu1, nu2
+        self.levels = []
+        coords = None
+        while True:
+            d = A.diagonal()
+            if np.any(d == 0):
+                raise ValueError("Zero on the diagonal: the smoothers need a nonzero diagonal.")
+            if smoother == "jacobi":
+                pre = post = jacobi_sweep(A, d, 2.0 / 3.0 if omega is None else omega)
+            else:
+                colors = _parity_colors(shape)
+                pre = multicolor_sweep(A, d, 1.0 if omega is None else omega, colors)
+                post = multicolor_sweep(A, d, 1.0 if omega is None else omega, colors.max() - colors)
+            if A.shape[0] <= coarse_size or not _coarsened(shape):
+                break
+            P, R, coords = transfer_operators(shape, coords)
+            self.levels.append(Level(A, shape, pre, post, P, R))
+            A = R.matmat(A.matmat(P))
+            shape = _coarse_shape(shape)
+        self.levels.append(Level(A, shape, pre, post, None, None))
+        # Coarsening stops only at <= coarse_size points or with every N <= 2,
+        # so the dense LU is at most max(coarse_size, 2^d) in size
+        self.coarse = lu_factor(A.toarray())
+        if np.any(np.diag(self.coarse[0]) == 0):
+            raise np.linalg.LinAlgError("Singular coarsest-grid matrix")
+
+    def cycle(self, x, b, kind="V", level=0):
+        """One V- (gamma = 1) or W-cycle (gamma = 2) on x, in place."""
+        lvl = self.levels[level]
+        if lvl.P is None:
+            x[:] = lu_solve(self.coarse, b)
+            return x
+        for _ in range(self.nu1):
+            lvl.pre(x, b)
+        rc = lvl.R @ (b - lvl.A @ x)
+        ec = np.zeros(len(rc))
+        gamma = 2 if kind == "W" and self.levels[level + 1].P is not None else 1
+        for _ in range(gamma):
+            self.cycle(ec, rc, kind, level + 1)
+        x += lvl.P @ ec
+        for _ in range(self.nu2):
+            lvl.post(x, b)
+        return x
+
+    def solve(self, b, x0=None, tol=1e-8, max_iter=50, kind="V", history=100, callback=None):
+        """Repeat cycles until ||b - A x|| / ||b|| <= tol."""
+        if kind not in ("V", "W"):
+            raise ValueError("kind must be 'V' or 'W'")
+        A = self.levels[0].A
+        b = np.asarray(b, dtype=float)
+        x = np.zeros(len(b)) if x0 is None else np.array(x0, dtype=float)
+        bnorm = np.linalg.norm(b) or 1.0
+        hist = deque([np.linalg.norm(b - A @ x) / bnorm], maxlen=history)
+        for k in range(1, max_iter + 1):
+            if hist[-1] <= tol:
+                return IterativeResult(x, k - 1, True, list(hist))
+            self.cycle(x, b, kind)
+            if callback is not None:
+                callback(k, x)
+            hist.append(np.linalg.norm(b - A @ x) / bnorm)
+        return IterativeResult(x, max_iter, hist[-1] <= tol, list(hist))
+
+
+# Function to solve A x = b on a structured grid with multigrid cycles
+def multigrid(A, b, shape, x0=None, tol=1e-8, max_iter=50, kind="V", smoother="gauss_seidel",
+              nu1=2, nu2=2, history=100, callback=None):
+    mg = Multigrid(A, shape, smoother, nu1, nu2)
+    return mg.solve(b, x0, tol, max_iter, kind, history, callback)
@@ -0,0 +1,186 @@
+# Domain-decomposed block-Jacobi solver on several processes.
+# A (CSR), b, the diagonal and two iterate buffers live in
+# multiprocessing.shared_memory, so workers read and write them in place.
+# Each worker owns a contiguous block of rows: once per sweep it reads the
+# halo (its coupling to x outside the block) from the shared iterate, then
+# runs `inner` Jacobi sweeps on its own block and writes the new values
+# into the other buffer. Two barriers per sweep keep the workers in step.
+import os
+import threading
+import time
+from collections import deque
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+
+from csr import CSRMatrix, as_csr
+from iterative import IterativeResult
+
+
+# Function to copy an array into a new shared-memory segment
+def _share(arr, segments):
+    arr = np.ascontiguousarray(arr)
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    segments.append(shm)
+    view = np.ndarray(arr.shape, arr.dtype, buffer=shm.buf)
+    view[...] = arr
+    return shm.name, arr.shape, arr.dtype.str
+
+
+# Function to map a shared-memory segment created by _share
+def _attach(spec, segments):
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    segments.append(shm)  # keeps the mapping alive as long as the views
+    return np.ndarray(shape, np.dtype(dtype), buffer=shm.buf)
+
+
+# Function to split the rows into `parts` contiguous blocks of similar nnz
+def partition_rows(indptr, parts):
+    n = len(indptr) - 1
+    targets = np.linspace(0, indptr[-1], parts + 1)
+    cuts = np.searchsorted(indptr, targets[1:-1])
+    bounds = np.concatenate(([0], cuts, [n]))
+    return np.maximum.accumulate(bounds)
+
+
+# Worker: one block of rows, sweeps until the coordinator says stop
+def _worker(specs, r0, r1, w, inner, barrier):
+    segments = []  # mappings are released when the worker exits
+    try:
+        data, indices, indptr, b, d, xs, res2, ctrl = (_attach(s, segments) for s in specs)
+        s, e = indptr[r0], indptr[r1]
+        rows = np.repeat(np.arange(r1 - r0), np.diff(indptr[r0:r1 + 1]))
+        cols = indices[s:e]
+        vals = data[s:e]
+        inside = (cols >= r0) & (cols < r1)
+        off_diag = inside & (cols != rows + r0)
+        # Block-private pieces: coupling inside the block and to the halo
+        A_in = CSRMatrix.from_coo(rows[off_diag], cols[off_diag] - r0, vals[off_diag], (r1 - r0, r1 - r0))
+        A_halo = CSRMatrix.from_coo(rows[~inside], cols[~inside], vals[~inside], (r1 - r0, len(b)))
+        b_loc, d_loc = b[r0:r1], d[r0:r1]
+        cur = 0
+        while True:
+            x_old = xs[cur]
+            rhs = b_loc - A_halo.matvec(x_old)  # halo read once per sweep
+            x_loc = x_old[r0:r1]
+            y = rhs - A_in.matvec(x_loc)
+            res2[w] = np.dot(y - d_loc * x_loc, y - d_loc * x_loc)  # ||b - A x_k||^2 on this block
+            x_loc = y / d_loc
+            for _ in range(inner - 1):
+                x_loc = (rhs - A_in.matvec(x_loc)) / d_loc
+            xs[1 - cur][r0:r1] = x_loc
+            barrier.wait()  # all blocks written
+            barrier.wait()  # coordinator has decided
+            if ctrl[0]:
+                break
+            cur = 1 - cur
+    except threading.BrokenBarrierError:
+        pass
+    except BaseException:
+        barrier.abort()
+        raise
+
+
+# Function to solve A x = b with block Jacobi on `workers` processes
+def block_jacobi(A, b, x0=None, workers=None, tol=1e-8, max_iter=1000, inner=1, history=100):
+    """
+    inner=1 is exactly the point Jacobi iteration of iterative.jacobi(); inner > 1
+    repeats the local sweep with frozen halo values (more work per exchange).
+    Stops when ||b - A x|| / ||b|| <= tol, measured at the start of each sweep.
+    """
+    A = as_csr(A)
+    b = np.asarray(b, dtype=float)
+    n = len(b)
+    if A.shape != (n, n):
+        raise ValueError("A must be n x n and b must have n entries.")
+    d = A.diagonal()
+    if np.any(d == 0):
+        raise ValueError("Zero on the diagonal: Jacobi needs a nonzero diagonal.")
+    workers = max(1, min(workers or os.cpu_count() or 1, n))
+    bounds = partition_rows(A.indptr, workers)
+    xs = np.zeros((2, n))
+    if x0 is not None:
+        xs[0] = x0
+
+    ctx = get_context()
+    segments = []
+    procs = []
+    try:
+        specs = [_share(a, segments) for a in (A.data, A.indices, A.indptr, b, d, xs,
+                                                  np.zeros(workers), np.zeros(1, dtype=np.int64))]
+        views = [np.ndarray(shape, np.dtype(dtype), buffer=shm.buf)
+                 for (_, shape, dtype), shm in zip(specs[5:], segments[5:])]
+        x_sh, res2, ctrl = views
+        barrier = ctx.Barrier(workers + 1)
+        for w in range(workers):
+            p = ctx.Process(target=_worker, args=(specs, bounds[w], bounds[w + 1], w, inner, barrier),
+                            daemon=True)
+            p.start()
+            procs.append(p)
+
+        bnorm = np.linalg.norm(b) or 1.0
+        hist = deque(maxlen=history)
+        cur = 0
+        k = 0
+        try:
+            while True:
+                barrier.wait()
+                hist.append(np.sqrt(res2.sum()) / bnorm)
+                done = hist[-1] <= tol or k == max_iter
+                ctrl[0] = done
+                barrier.wait()
+                if done:
+                    break
+                cur = 1 - cur
+                k += 1
+        except threading.BrokenBarrierError:
+            raise RuntimeError("A block-Jacobi worker failed.") from None
+        return IterativeResult(x_sh[cur].copy(), k, hist[-1] <= tol, list(hist))
+    finally:
+        views = x_sh = res2 = ctrl = None  # drop the views before closing the segments
+        for p in procs:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+        for shm in segments:
+            shm.close()
+            shm.unlink()
+
+
+# Function to build a banded, diagonally dominant test system (n rows, 2*half+1 bands)
+def banded_system(n, half=2, seed=0):
+    rng = np.random.default_rng(seed)
+    offsets = [k for k in range(-half, half + 1) if k]
+    rows = np.concatenate([np.arange(max(0, -k), n - max(0, k)) for k in offsets])
+    cols = np.concatenate([np.arange(max(0, k), n + min(0, k)) for k in offsets])
+    vals = -rng.random(len(rows))
+    diag = 0.1 + np.bincount(rows, weights=-vals, minlength=n)
+    A = CSRMatrix.from_coo(np.concatenate((rows, np.arange(n))), np.concatenate((cols, np.arange(n))),
+                           np.concatenate((vals, diag)), (n, n))
+    return A, rng.random(n)
+
+
+# Function to time a fixed number of sweeps for several worker counts
+def benchmark(n=2_000_000, half=2, sweeps=50, worker_counts=None):
+    """Prints sweeps per second (wall time, worker start-up included) and the speedup over one worker."""
+    A, b = banded_system(n, half)
+    cores = os.cpu_count() or 1
+    if worker_counts is None:
+        worker_counts = sorted({1, 2, 4, 8, 16, 32, cores} & set(range(1, cores + 1)))
+    print(f"n = {n}, nnz = {A.nnz}, {sweeps} sweeps, {cores} cores")
+    print(f"{'workers':>8} {'time (s)':>10} {'sweeps/s':>10} {'speedup':>8}")
+    base = None
+    curve = []
+    for w in worker_counts:
+        start = time.perf_counter()
+        block_jacobi(A, b, workers=w, tol=0.0, max_iter=sweeps)
+        elapsed = time.perf_counter() - start
+        base = base or elapsed
+        curve.append((w, base / elapsed))
+        print(f"{w:>8} {elapsed:>10.3f} {sweeps / elapsed:>10.1f} {base / elapsed:>8.2f}")
+    return curve
+
+
+if __name__ == "__main__":
+    benchmark()
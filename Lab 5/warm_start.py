@@ -0,0 +1,108 @@
+# Warm starts for iterative solvers across Streamlit reruns.
+# The last converged solution is kept per (method, shape, sparsity pattern).
+# When A and b have changed only slightly, it becomes the next initial guess.
+# A is not stored: a fixed random sketch A @ G (n x 8 numbers) is enough to
+# estimate ||A - A_old|| / ||A_old||. Total memory is bounded and the least
+# recently used entries are evicted first.
+import hashlib
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from csr import as_csr, is_sparse
+
+WarmStartInfo = namedtuple("WarmStartInfo", ["hits", "misses", "evictions", "size", "nbytes", "max_bytes"])
+
+SKETCH_COLUMNS = 8
+
+
+# Function to key a problem by method, shape and sparsity pattern (not the values)
+def structure_key(method, A):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(method).encode())
+    if is_sparse(A):
+        A = as_csr(A)
+        h.update(str(A.shape).encode())
+        h.update(A.indptr.tobytes())
+        h.update(A.indices.tobytes())
+    else:
+        A = np.asarray(A, dtype=float)
+        h.update(str(A.shape).encode())
+        h.update(np.packbits(A != 0).tobytes())
+    return h.hexdigest()
+
+
+# Function to compute the sketch A @ G with a fixed Gaussian G (same G for the same n)
+def _sketch(A):
+    A = as_csr(A) if is_sparse(A) else np.asarray(A, dtype=float)
+    n = A.shape[1]
+    G = np.random.default_rng(n).standard_normal((n, SKETCH_COLUMNS))
+    if is_sparse(A):
+        return np.column_stack([A @ G[:, k] for k in range(SKETCH_COLUMNS)])
+    return A @ G
+
+
+# Function to measure the relative change of a vector (0 when both are empty or zero)
+def _relative_change(new, old):
+    scale = np.linalg.norm(old)
+    if scale == 0:
+        return 0.0 if np.linalg.norm(new) == 0 else np.inf
+    return np.linalg.norm(new - old) / scale
+
+
+class WarmStartCache:
+    """
+    get() returns a stored solution if the relative change of A (estimated from
+    the sketch) plus that of b is at most `threshold`, else None.
+    put() stores a solution.
+    """
+
+    def __init__(self, max_bytes=64 * 2**20, threshold=0.25):
+        self.max_bytes = max_bytes
+        self.threshold = threshold
+        self._entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, method, A, b=None):
+        key = structure_key(method, A)
+        entry = self._entries.get(key)
+        if entry is not None:
+            sketch, b_old, x = entry
+            change = _relative_change(_sketch(A), sketch)
+            if b is not None:
+                change += _relative_change(np.asarray(b, dtype=float), b_old)
+            if change <= self.threshold:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return x.copy()
+        self.misses += 1
+        return None
+
+    def put(self, method, A, b, x):
+        key = structure_key(method, A)
+        b = np.zeros(0) if b is None else np.array(b, dtype=float)
+        entry = (_sketch(A), b, np.array(x, copy=True))
+        size = sum(a.nbytes for a in entry)
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= sum(a.nbytes for a in old)
+        self._entries[key] = entry
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= sum(a.nbytes for a in evicted)
+            self.evictions += 1
+
+    def cache_info(self):
+        return WarmStartInfo(self.hits, self.misses, self.evictions, len(self._entries),
+                             self.nbytes, self.max_bytes)
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = 0
@@ -1,25 +1,20 @@
 ### Power method application
 ### Use the power method and write a complete python program to find the dominant eigen value of a n by n square matrix. Input will be flexible to the user input and error tolarance and final output will be dominant egen value and egien vector
+import os
+import sys
+
 import numpy as np
 import streamlit as st
 
-def power_method(A, tol=1e-6, max_iter=1):
-    n = A.shape[0]
-    x = np.ones(n)
-    eigenvalue_old = 0
-
-    for i in range(max_iter):
-        x_new = np.dot(A, x)
-        eigenvalue_new = np.max(x_new)
-        x_new = x_new / eigenvalue_new
-        
-        if abs(eigenvalue_new - eigenvalue_old) < tol:
-            break
+# The warm-start cache lives in Lab 5
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab 5"))
+from warm_start import WarmStartCache
 
-        x = x_new
-        eigenvalue_old = eigenvalue_new
+# The structure-aware direct solver lives in Lab 3
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab 3"))
+from eigen_dispatch import eig
 
-    return eigenvalue_new, x_new, i+1
+from eigen import inverse_iteration, lanczos, power_method, subspace_iteration
 
 
 # ------------- STREAMLIT UI --------------
@@ -39,17 +34,65 @@ for i in range(n):
         row.append(val)
     matrix.append(row)
 
-A = np.array(matrix)
+A = np.array(matrix, dtype=float)
+
+tol = st.number_input("Tolerance (relative residual ||Ax - lambda x|| / |lambda|)", value=1e-6, format="%.7f")
+max_iter = st.number_input("Max Iterations", min_value=1, value=1000, step=1)
+target = st.radio("Find", ["Dominant eigenvalues", "Eigenvalues nearest a target"], horizontal=True)
+k = st.number_input("Number of eigenpairs", min_value=1, max_value=n, value=1, step=1)
+if target != "Dominant eigenvalues":
+    sigma = st.number_input("Target sigma", value=0.0,
+                            help="Shift-invert: A - sigma I is factored once; more than one pair needs a symmetric matrix")
+elif k == 1:
+    shift = st.number_input("Shift (finds the eigenvalue farthest from the shift)", value=0.0)
+    accelerate = st.selectbox("Acceleration", ["none", "aitken", "chebyshev"],
+                              help="chebyshev needs a symmetric matrix")
 
-tol = st.number_input("Tolerance", value=1e-6, format="%.7f")
-max_iter = st.number_input("Max Iterations", min_value=1, value=10, step=1)
+warm_start = st.checkbox("Start from the last eigenvector of a similar matrix", value=True)
+warm_cache = st.session_state.setdefault("warm_start_cache", WarmStartCache())
+direct = st.checkbox("Compare with all eigenvalues from a direct solver",
+                     help="Diagonal/triangular: read off; symmetric: eigh; general: eig")
 
 if st.button("Compute Dominant Eigen"):
-    eigenvalue, eigenvector, iterations = power_method(A, tol, max_iter)
-    st.success("✅ Computation Successful!")
+    key = f"power-{k}" if target == "Dominant eigenvalues" else f"nearest-{k}-{sigma}"
+    x0 = warm_cache.get(key, A) if warm_start else None
+    try:
+        if target != "Dominant eigenvalues" and k == 1:
+            result = inverse_iteration(A, sigma, tol, int(max_iter), x0)
+            values, vectors = [result.value], result.vector[:, None]
+        elif target != "Dominant eigenvalues":
+            result = lanczos(A, int(k), sigma, tol=tol, max_iter=int(max_iter),
+                             v0=None if x0 is None else x0[:, 0])
+            values, vectors = result.values, result.vectors
+        elif k == 1:
+            result = power_method(A, tol, int(max_iter), x0, shift,
+                                  None if accelerate == "none" else accelerate)
+            values, vectors = [result.value], result.vector[:, None]
+        else:
+            result = subspace_iteration(A, int(k), tol, int(max_iter), X0=x0)
+            values, vectors = result.values, result.vectors
+    except (ValueError, np.linalg.LinAlgError) as e:
+        st.error(str(e))
+        st.stop()
+    if result.converged:
+        warm_cache.put(key, A, None, vectors[:, 0] if k == 1 else vectors)
+        st.success("✅ Computation Successful!")
+    else:
+        st.warning(f"Not converged to the tolerance after {result.iterations} iterations")
     st.write("### 🔹 Results")
-    st.write(f"**Dominant Eigen Value:** `{eigenvalue:.6f}`")
-    st.write(f"**Eigen Vector:** `{eigenvector}`")
-    st.write(f"**Iterations Taken:** `{iterations}`")
+    for i, value in enumerate(values):
+        st.write(f"**Eigen Value {i + 1}:** `{value:.6f}`")
+        st.write(f"**Eigen Vector {i + 1}:** `{vectors[:, i]}`")
+    st.write(f"**Iterations Taken:** `{result.iterations}`")
+    if k == 1:
+        st.line_chart(result.history)
+    else:
+        st.write(f"**Residuals ||Av - lambda v|| / |lambda|:** `{result.residuals}`")
+    if x0 is not None:
+        st.caption("Started from the cached eigenvector of a similar matrix")
+    if direct:
+        spectrum = eig(A, vectors=False)
+        st.write(f"**All Eigen Values (direct):** `{spectrum.values}`")
+        st.caption(f"Direct path: {spectrum.path}")
 
     
@@ -0,0 +1,419 @@
+# Power method, subspace iteration and Lanczos for selected eigenpairs.
+#   power_method       - one eigenpair: Rayleigh quotient, residual stop,
+#                        optional shift and Aitken / Chebyshev acceleration
+#   subspace_iteration - the top-k eigenpairs at once (block power + Rayleigh-Ritz)
+#   inverse_iteration  - the eigenpair nearest a target sigma (shift-invert)
+#   lanczos            - k extreme eigenpairs of symmetric A, or the k nearest
+#                        sigma (thick-restart Lanczos, optionally shift-inverted)
+# A may be a NumPy array, a list of lists, a sparse matrix (Lab 5 CSR / scipy)
+# or a matrix-free operator (Lab 5 LinearOperator: only products A x are used).
+import hashlib
+import os
+import sys
+from collections import OrderedDict, deque, namedtuple
+
+import numpy as np
+
+# Sparse matrix and operator support lives in Lab 5
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab 5"))
+from csr import is_sparse
+from linear_operator import as_system, is_operator, known_symmetric
+
+# The LU cache lives in Lab 4, the LU itself in Lab 1
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab 4"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab 1"))
+from determinant import lu_solve
+from solver_cache import LUCache
+
+PowerResult = namedtuple("PowerResult", ["value", "vector", "iterations", "converged", "history"])
+EigenpairsResult = namedtuple("EigenpairsResult", ["values", "vectors", "iterations", "converged", "residuals"])
+
+# Sparse A - sigma I is factored densely (O(n^2) memory) only up to this size when scipy is missing
+DENSE_LIMIT = 3000
+
+# Factorizations of A - sigma I, reused while A and sigma stay the same
+shifted_cache = LUCache(maxsize=8)
+_sparse_factors = OrderedDict()
+
+
+# Function to accept dense, sparse or matrix-free A
+def _operator(A):
+    A = as_system(A)
+    if len(A.shape) != 2 or A.shape[0] != A.shape[1]:
+        raise ValueError("A must be a square matrix.")
+    return A
+
+
+# Function to find the dominant eigenvalue (largest |lambda - shift|) and its eigenvector
+def power_method(A, tol=1e-8, max_iter=1000, x0=None, shift=0.0, accelerate=None,
+                 history=100, callback=None):
+    """
+    Iterates x <- (A - shift I) x / ||.||_2 (2-norm, so negative eigenvalues are
+    fine), estimates lambda by the Rayleigh quotient x^T A x and stops when the
+    residual ||A x - lambda x|| <= tol * |lambda|.
+    accelerate:
+      None        - plain power iteration
+      "aitken"    - Aitken delta^2 on three successive iterates, kept only if
+                    it lowers the residual (removes the lambda_2 / lambda_1
+                    error term on clustered spectra); no extra products
+      "chebyshev" - symmetric A only: blocks of Chebyshev-filtered steps damp
+                    [-|lambda_2|, |lambda_2|], each followed by one plain
+                    step whose residual re-estimates |lambda_2|
+    iterations counts products with A. Iterates of a negative lambda - shift
+    alternate in sign; they are aligned before Aitken is applied.
+    """
+    A = _operator(A)
+    n = A.shape[0]
+    if accelerate not in (None, "aitken", "chebyshev"):
+        raise ValueError("accelerate must be None, 'aitken' or 'chebyshev'")
+    if accelerate == "chebyshev" and not known_symmetric(A):
+        raise ValueError("Chebyshev acceleration needs a symmetric matrix.")
+    x = np.ones(n) if x0 is None else np.array(x0, dtype=float)
+    norm = np.linalg.norm(x)
+    if norm == 0:
+        raise ValueError("The starting vector must be nonzero.")
+    x /= norm
+    Ax = A @ x
+    hist = deque(maxlen=history)
+    recent = deque(maxlen=3)  # (x, A x) pairs for Aitken
+    prev = None               # (x, A x, lambda, scale) of the last plain step, for Chebyshev
+    k = 0
+    while True:
+        lam = x @ Ax
+        res = np.linalg.norm(Ax - lam * x) / max(abs(lam), np.finfo(float).tiny)
+        hist.append(res)
+        if callback is not None:
+            callback(k, lam, x)
+        if res <= tol:
+            return PowerResult(lam, x, k, True, list(hist))
+        if k >= max_iter:
+            return PowerResult(lam, x, k, False, list(hist))
+
+        if accelerate == "chebyshev" and k >= 10 and prev is not None:
+            rate = _second_eigenvalue(*prev, Ax, shift) / abs(lam - shift)
+            degree = max(1, min(10, max_iter - k))
+            x, Ax = _chebyshev_block(A, x, Ax, lam, shift, rate, degree)
+            k += degree
+            prev = None  # the next plain step gives a new estimate
+            continue
+
+        y = Ax - shift * x
+        scale = np.linalg.norm(y)
+        prev = (x, Ax, lam, scale)
+        x = y / scale
+        Ax = A @ x
+        k += 1
+        if accelerate == "aitken":
+            # (A - shift I) flips the sign of the wanted component when lambda - shift < 0
+            x, Ax = (-x, -Ax) if lam - shift < 0 else (x, Ax)
+            recent.append((x, Ax))
+            if len(recent) == 3:
+                z = _aitken(*recent)
+                # Both residuals come from stored products, so a rejected z costs nothing;
+                # z must also not move the Rayleigh quotient away from the dominant eigenvalue
+                if z is not None:
+                    lam_x, lam_z = x @ Ax, z[0] @ z[1]
+                    if (abs(lam_z - shift) >= abs(lam_x - shift)
+                            and np.linalg.norm(z[1] - lam_z * z[0]) < np.linalg.norm(Ax - lam_x * x)):
+                        x, Ax = z
+                recent.clear()
+                recent.append((x, Ax))
+
+
+def _aitken(p0, p1, p2):
+    """
+    Delta^2 extrapolation of three (x, A x) pairs. The iterates behave like
+    v_1 + c rho^k v_2, so with rho = <x2 - x1, x1 - x0> / ||x1 - x0||^2 the
+    combination z = (x2 - rho x1) / (1 - rho) removes the v_2 term. z is
+    linear in the iterates, so A z comes from the stored products for free.
+    Returns (z, A z) normalized, or None while the steps x1 - x0 and x2 - x1
+    are not yet parallel (no single error term dominates).
+    """
+    (x0, _), (x1, Ax1), (x2, Ax2) = p0, p1, p2
+    d1, d2 = x1 - x0, x2 - x1
+    denom = d1 @ d1
+    if denom == 0:
+        return None
+    rho = (d2 @ d1) / denom
+    # Only extrapolate once one error term dominates: successive steps (nearly) parallel
+    if not abs(rho) < 1 or abs(d2 @ d1) < 0.99 * np.sqrt(denom * (d2 @ d2)):
+        return None
+    z, Az = (x2 - rho * x1) / (1 - rho), (Ax2 - rho * Ax1) / (1 - rho)
+    norm = np.linalg.norm(z)
+    if not np.isfinite(norm) or norm == 0:
+        return None
+    return z / norm, Az / norm
+
+
+def _second_eigenvalue(x, Ax, lam, scale, Ax_next, shift):
+    """
+    Estimates |lambda_2 - shift| from one plain step x -> x_next =
+    (A - shift I) x / scale. The residual r = A x - lambda x has little
+    component along the wanted eigenvector once x is close to it, so
+    ||(A - shift I) r|| / ||r|| is a weighted mean of the unwanted
+    |lambda_i - shift|, dominated by the least damped one.
+    (A - shift I) r = scale A x_next - lambda A x + lambda shift x comes from
+    products already made.
+    """
+    r = Ax - lam * x
+    rr = np.linalg.norm(r)
+    if rr == 0:
+        return 0.0
+    return np.linalg.norm(scale * Ax_next - lam * Ax + lam * shift * x) / rr
+
+
+def _chebyshev_block(A, x, Ax, lam, shift, rate, degree):
+    """
+    `degree` steps of the scaled three-term Chebyshev recurrence for the
+    polynomial that is small on [-b, b], b = rate |lambda - shift|, and
+    grows with |t| outside it, so the eigenvalue of largest |lambda - shift|
+    gains the most whatever its sign. Works on B = s (A - shift I) with the
+    sign s chosen so the current estimate is positive. Returns the normalized
+    result and its product with A: `degree` products in all.
+    """
+    s = 1.0 if lam - shift >= 0 else -1.0
+    target = abs(lam - shift)
+    # Every unwanted eigenvalue of B should lie in [-b, b], b = |lambda_2 - shift|
+    rate = min(max(rate, 0.01), 0.999)
+    a, b = -rate * target, rate * target
+    e, c = (b - a) / 2, (b + a) / 2
+    sigma = e / (target - c)
+    sigma1 = sigma
+    y = (s * (Ax - shift * x) - c * x) * (sigma1 / e)
+    for _ in range(1, degree):
+        sigma_new = 1.0 / (2.0 / sigma1 - sigma)
+        y_new = (2.0 * sigma_new / e) * (s * (A @ y - shift * y) - c * y) - (sigma * sigma_new) * x
+        x, y = y, y_new
+        sigma = sigma_new
+    y /= np.linalg.norm(y)
+    return y, A @ y
+
+
+# Function to find the k eigenvalues of largest magnitude and their eigenvectors
+def subspace_iteration(A, k=1, tol=1e-8, max_iter=1000, X0=None, guard=None, seed=0):
+    """
+    Block power iteration on k + guard vectors: X <- orth(A X), then the
+    Rayleigh-Ritz step solves the small (k+guard)^2 problem Q^T A Q. The guard
+    vectors make the convergence rate |lambda_{k+guard+1} / lambda_k| instead
+    of |lambda_{k+1} / lambda_k|, which matters when lambda_k and lambda_{k+1}
+    are close. Stops when every wanted pair has ||A v - lambda v|| <= tol |lambda|.
+    """
+    A = _operator(A)
+    n = A.shape[0]
+    if not 1 <= k <= n:
+        raise ValueError("k must be between 1 and n.")
+    p = min(n, k + (min(k, 5) if guard is None else guard))
+    symmetric = known_symmetric(A)
+    if X0 is None:
+        X = np.random.default_rng(seed).standard_normal((n, p))
+    else:
+        X = np.array(X0, dtype=float).reshape(n, -1)
+        if X.shape[1] < p:
+            extra = np.random.default_rng(seed).standard_normal((n, p - X.shape[1]))
+            X = np.hstack((X, extra))
+        X = X[:, :p]
+    Q, _ = np.linalg.qr(X)
+    residuals = np.full(k, np.inf)
+    for it in range(1, max_iter + 1):
+        AQ = _apply(A, Q)
+        H = Q.T @ AQ
+        if symmetric:
+            theta, S = np.linalg.eigh((H + H.T) / 2)
+        else:
+            theta, S = np.linalg.eig(H)
+            if np.abs(theta.imag).max() > 1e-10 * np.abs(theta).max():
+                raise ValueError("Complex Ritz values: subspace_iteration handles real dominant spectra only.")
+            theta, S = theta.real, S.real
+        order = np.argsort(-np.abs(theta))
+        theta, S = theta[order], S[:, order]
+        V = Q @ S
+        AV = AQ @ S
+        R = AV[:, :k] - V[:, :k] * theta[:k]
+        residuals = np.linalg.norm(R, axis=0) / np.maximum(np.abs(theta[:k]), np.finfo(float).tiny)
+        if np.all(residuals <= tol):
+            return EigenpairsResult(theta[:k], V[:, :k], it, True, residuals)
+        Q, _ = np.linalg.qr(AV)
+    return EigenpairsResult(theta[:k], V[:, :k], max_iter, False, residuals)
+
+
+# Function to multiply A by each column of X (dense, sparse or matrix-free A)
+def _apply(A, X):
+    if isinstance(A, np.ndarray):
+        return A @ X
+    return np.column_stack([A @ X[:, j] for j in range(X.shape[1])])
+
+
+# Function to build x -> (A - sigma I)^-1 x from one (cached) factorization
+def shift_invert(A, sigma):
+    """
+    Dense A: LU of A - sigma I from a Lab 4 LUCache, so a repeated (A, sigma)
+    is factored only once. Sparse A: scipy's sparse LU (splu, also cached) if
+    scipy is installed, otherwise the dense LU for n <= DENSE_LIMIT. A sigma
+    that is exactly an eigenvalue is moved by a relative 1e-10.
+    """
+    A = _operator(A)
+    if is_operator(A):
+        raise ValueError("Shift-invert needs the entries of A to factor A - sigma I; "
+                         "use lanczos() without sigma for a matrix-free operator.")
+    n = A.shape[0]
+    if is_sparse(A):
+        try:
+            from scipy.sparse import csr_matrix, identity
+            from scipy.sparse.linalg import splu
+        except ImportError:
+            if n > DENSE_LIMIT:
+                raise ValueError(f"Sparse shift-invert with n > {DENSE_LIMIT} needs scipy.") from None
+            A = A.toarray()
+        else:
+            return _sparse_shift_invert(A, sigma, csr_matrix, identity, splu)
+    for shift in (sigma, sigma + 1e-10 * max(1.0, abs(sigma))):
+        try:
+            factors = shifted_cache.factor(A - shift * np.eye(n))
+            return lambda x: lu_solve(factors, x)
+        except np.linalg.LinAlgError:
+            pass
+    raise np.linalg.LinAlgError("A - sigma I is singular.")
+
+
+def _sparse_shift_invert(A, sigma, csr_matrix, identity, splu):
+    h = hashlib.blake2b(digest_size=16)
+    for a in (A.data, A.indices, A.indptr, np.array([sigma])):
+        h.update(a.tobytes())
+    key = h.hexdigest()
+    lu = _sparse_factors.get(key)
+    if lu is None:
+        S = csr_matrix((A.data, A.indices, A.indptr), shape=A.shape)
+        for shift in (sigma, sigma + 1e-10 * max(1.0, abs(sigma))):
+            try:
+                lu = splu((S - shift * identity(A.shape[0], format="csr")).tocsc())
+                break
+            except RuntimeError:  # exactly singular
+                pass
+        else:
+            raise np.linalg.LinAlgError("A - sigma I is singular.")
+        _sparse_factors[key] = lu
+        if len(_sparse_factors) > shifted_cache.maxsize:
+            _sparse_factors.popitem(last=False)
+    else:
+        _sparse_factors.move_to_end(key)
+    return lu.solve
+
+
+# Function to find the eigenvalue nearest sigma and its eigenvector
+def inverse_iteration(A, sigma=0.0, tol=1e-8, max_iter=100, x0=None, history=100, callback=None):
+    """
+    Power method on (A - sigma I)^-1, which converges at the rate
+    |lambda_1 - sigma| / |lambda_2 - sigma| (lambda_1 nearest sigma, lambda_2
+    next). A - sigma I is factored once; every step is then one solve with the
+    factors and one product with A. Same Rayleigh quotient and residual stop as
+    power_method().
+    """
+    A = _operator(A)
+    solve = shift_invert(A, sigma)
+    x = np.ones(A.shape[0]) if x0 is None else np.array(x0, dtype=float)
+    norm = np.linalg.norm(x)
+    if norm == 0:
+        raise ValueError("The starting vector must be nonzero.")
+    x /= norm
+    Ax = A @ x
+    hist = deque(maxlen=history)
+    k = 0
+    while True:
+        lam = x @ Ax
+        res = np.linalg.norm(Ax - lam * x) / max(abs(lam), np.finfo(float).tiny)
+        hist.append(res)
+        if callback is not None:
+            callback(k, lam, x)
+        if res <= tol or k >= max_iter:
+            return PowerResult(lam, x, k, res <= tol, list(hist))
+        y = solve(x)
+        x = y / np.linalg.norm(y)
+        Ax = A @ x
+        k += 1
+
+
+# Function to find k eigenpairs of symmetric A with the thick-restart Lanczos method
+def lanczos(A, k=1, sigma=None, which="LM", tol=1e-8, max_iter=300, ncv=None, v0=None, seed=0):
+    """
+    Builds an orthonormal Krylov basis of ncv vectors (default max(2k + 1, 20)),
+    reorthogonalized in full (two Gram-Schmidt passes), and takes Ritz pairs
+    of the projected matrix T. On restart the best k + (ncv - k) // 2 Ritz
+    vectors and the last residual direction are kept (thick restart), so no
+    information about the wanted pairs is thrown away.
+    sigma=None: the k eigenvalues largest in magnitude ("LM"), algebraically
+    largest ("LA") or smallest ("SA"), from products with A only (matrix-free
+    operators work). With sigma the basis is built for (A - sigma I)^-1, whose
+    dominant eigenvalues 1 / (lambda - sigma) belong to the k eigenvalues
+    nearest sigma; they come back nearest first. Like any single-vector Krylov
+    method it may return a repeated eigenvalue only once.
+    A pair counts as converged when the Lanczos estimate |beta s_m| of its
+    residual is at most tol * max(|theta|, ||T||), theta its Ritz value, so
+    an eigenvalue of 0 converges too. iterations counts restarts; residuals
+    are the actual ||A v - lambda v|| / |lambda| (without sigma the
+    denominator is at least ||T||, about ||A||).
+    """
+    A = _operator(A)
+    n = A.shape[0]
+    if not 1 <= k <= n:
+        raise ValueError("k must be between 1 and n.")
+    if which not in ("LM", "LA", "SA"):
+        raise ValueError("which must be 'LM', 'LA' or 'SA'")
+    if not known_symmetric(A):
+        raise ValueError("Lanczos needs a symmetric matrix.")
+    m = min(n, max(2 * k + 1, 20) if ncv is None else int(ncv))
+    if m < min(n, k + 1):
+        raise ValueError("ncv must be larger than k.")
+    if sigma is None:
+        op = lambda x: A @ x
+    else:
+        op = shift_invert(A, sigma)
+        which = "LM"
+    rng = np.random.default_rng(seed)
+    V = np.zeros((n, m + 1))
+    T = np.zeros((m, m))
+    v = rng.standard_normal(n) if v0 is None else np.array(v0, dtype=float)
+    if np.linalg.norm(v) == 0:
+        raise ValueError("The starting vector must be nonzero.")
+    V[:, 0] = v / np.linalg.norm(v)
+    start = 0
+    for it in range(1, max_iter + 1):
+        for j in range(start, m):
+            w = op(V[:, j])
+            h = V[:, :j + 1].T @ w
+            w -= V[:, :j + 1] @ h
+            h2 = V[:, :j + 1].T @ w
+            w -= V[:, :j + 1] @ h2
+            T[:j + 1, j] = T[j, :j + 1] = h + h2
+            beta = np.linalg.norm(w)
+            if beta > np.finfo(float).eps * max(1.0, np.abs(T[:j + 1, :j + 1]).max()):
+                V[:, j + 1] = w / beta
+            else:
+                # Invariant subspace found: continue with a fresh direction (coupling 0)
+                beta = 0.0
+                V[:, j + 1] = 0.0
+                if j + 1 < n:
+                    w = rng.standard_normal(n)
+                    for _ in range(2):
+                        w -= V[:, :j + 1] @ (V[:, :j + 1].T @ w)
+                    V[:, j + 1] = w / np.linalg.norm(w)
+        theta, S = np.linalg.eigh(T)
+        order = {"LM": np.argsort(-np.abs(theta)), "LA": np.argsort(-theta), "SA": np.argsort(theta)}[which]
+        theta, S = theta[order], S[:, order]
+        # Relative to the Ritz value, but at least to ||T|| so that eigenvalues at or near 0 can converge
+        scale = max(np.abs(theta).max(), np.finfo(float).tiny)
+        estimates = np.abs(beta * S[-1, :k])
+        converged = bool(np.all(estimates <= tol * np.maximum(np.abs(theta[:k]), scale)))
+        if converged or it == max_iter:
+            break
+        keep = min(k + (m - k) // 2, m - 1)
+        V[:, :keep] = V[:, :m] @ S[:, :keep]
+        V[:, keep] = V[:, m]
+        T[:] = 0.0
+        T[np.arange(keep), np.arange(keep)] = theta[:keep]
+        start = keep
+    X = V[:, :m] @ S[:, :k]
+    values = theta[:k] if sigma is None else sigma + 1.0 / theta[:k]
+    R = _apply(A, X) - X * values
+    floor = scale if sigma is None else np.finfo(float).tiny
+    residuals = np.linalg.norm(R, axis=0) / np.maximum(np.abs(values), floor)
+    return EigenpairsResult(values, X, it, converged, residuals)